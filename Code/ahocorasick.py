@@ -0,0 +1,153 @@
+#!python3
+
+from collections import deque
+from prefixtree import PrefixTree
+
+
+class AhoCorasick:
+    """AhoCorasick: An automaton that finds every occurrence of every string
+       stored in a prefix tree inside a text, in one pass over the text.
+
+       The nodes of the prefix tree are the states of the automaton. Each node
+       gets a failure link to the node of the longest proper suffix of its
+       path that is also a path in the tree, which is followed when the next
+       character of the text has no child, and an output link to the nearest
+       terminal node along its failure links, so every string that ends at a
+       position of the text is found without rescanning it.
+
+       The links are kept in dictionaries keyed by node beside the tree, which
+       is not changed, but must not be changed while the automaton is in use.
+
+    """
+
+    def __init__(self, tree):
+        """Compile an automaton from the given PrefixTree, or raise ValueError
+           if a node of the tree has a label longer than one character (as in
+           a RadixTree).
+
+           Runtime Complexity:
+           O(n * b), where n is the number of nodes in the tree and b is the
+           largest number of children of a node, as the nodes are visited in
+           breadth-first order and the failure links followed to link each
+           one take at most as many steps in total as the depth of the node.
+
+        """
+        self.root = tree.root
+        self.size = tree.size
+        # Failure link and output link of each node
+        self.fail = {self.root: self.root}
+        self.output = {}
+        # String that each terminal node terminates, except the empty string
+        self.words = {}
+        queue = deque([(self.root, '')])
+        while len(queue) > 0:
+            node, path = queue.popleft()
+            for character, child in node.children.items():
+                if len(child.character) != 1:
+                    raise ValueError(f'Label {child.character!r} is not a '
+                                     f'single character')
+                word = path + character
+                if child.is_terminal() is True:
+                    self.words[child] = word
+                fail = self._next_state(self.fail[node], character)
+                if fail is child:
+                    # a node of depth one can only fail back to the root
+                    fail = self.root
+                self.fail[child] = fail
+                if fail in self.words:
+                    self.output[child] = fail
+                elif fail in self.output:
+                    self.output[child] = self.output[fail]
+                queue.append((child, word))
+
+    @classmethod
+    def from_strings(cls, strings):
+        """Return an automaton that finds the given strings."""
+        return cls(PrefixTree(strings))
+
+    def __repr__(self):
+        """Return a string representation of this automaton."""
+        return f'AhoCorasick({sorted(self.words.values())!r})'
+
+    def _next_state(self, node, character):
+        """Return the node that the automaton moves to from the given node on
+        the given character, following failure links until a node has a
+        child for it, or the root if none does."""
+        while node is not self.root and character not in node.children:
+            node = self.fail[node]
+        return node.children.get(character, self.root)
+
+    def scan(self, text):
+        """Generate a (position, string) pair for each occurrence of a stored
+           string in the given text, which is a string or an iterable of
+           strings (such as the lines or blocks of a large file) that are read
+           one at a time, where the position is the index in the whole text at
+           which the occurrence starts. Occurrences are generated in order of
+           where they end, from the longest to the shortest at each position,
+           including those that span the boundaries between strings of an
+           iterable. The empty string is never reported.
+
+           Runtime Complexity:
+           O(n + z) for a text of length n with z occurrences, since each
+           character moves down at most one node and each failure link
+           followed moves up at least one.
+
+        """
+        chunks = [text] if isinstance(text, str) else text
+        node = self.root
+        position = 0
+        for chunk in chunks:
+            for character in chunk:
+                position += 1
+                node = self._next_state(node, character)
+                match = node if node in self.words else self.output.get(node)
+                while match is not None:
+                    word = self.words[match]
+                    yield position - len(word), word
+                    match = self.output.get(match)
+
+    def find_all(self, text):
+        """Return a list of the (position, string) pairs of every occurrence
+        of a stored string in the given text, as generated by scan()."""
+        return list(self.scan(text))
+
+
+def main():
+    """Compare the time to find the words in the given vocabulary file that
+    occur in the given text file with an automaton and with a prefix tree
+    walk from every position of the text."""
+    import sys
+    import time
+    from autocomplete import get_lines
+    if len(sys.argv) != 3:
+        print(f'Usage: {sys.argv[0]} vocabulary-file text-file')
+        return
+    words = get_lines(sys.argv[1])
+    tree = PrefixTree(words)
+
+    start_time = time.time()
+    automaton = AhoCorasick(tree)
+    compile_time = time.time()
+    with open(sys.argv[2]) as file:
+        num_matches = sum(1 for match in automaton.scan(file))
+    scan_time = time.time()
+    with open(sys.argv[2]) as file:
+        text = file.read()
+    longest = max(map(len, words))
+    num_walk_matches = 0
+    for start in range(len(text)):
+        prefixes = tree.prefixes_of(text[start:start + longest])
+        num_walk_matches += len([prefix for prefix in prefixes if prefix])
+    walk_time = time.time()
+
+    print(f'Vocabulary size: {tree.size} words, text size: {len(text)} '
+          f'characters')
+    print(f'Compile time:  {compile_time - start_time:.6f} sec')
+    print(f'Scan time:     {scan_time - compile_time:.6f} sec, '
+          f'{num_matches} matches')
+    print(f'Walk time:     {walk_time - scan_time:.6f} sec, '
+          f'{num_walk_matches} matches')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!python3
+
+from ahocorasick import AhoCorasick
+from prefixtree import PrefixTree, RadixTree
+import unittest
+
+
+class AhoCorasickTest(unittest.TestCase):
+
+    def test_links(self):
+        tree = PrefixTree(['he', 'she', 'his', 'hers'])
+        automaton = AhoCorasick(tree)
+        node_s = tree.root.get_child('s')
+        node_sh = node_s.get_child('h')
+        node_she = node_sh.get_child('e')
+        node_h = tree.root.get_child('h')
+        node_he = node_h.get_child('e')
+        assert automaton.fail[node_s] is tree.root
+        assert automaton.fail[node_sh] is node_h
+        assert automaton.fail[node_she] is node_he
+        assert automaton.output[node_she] is node_he
+        assert node_he not in automaton.output
+        assert automaton.words[node_she] == 'she'
+
+    def test_scan(self):
+        automaton = AhoCorasick.from_strings(['he', 'she', 'his', 'hers'])
+        assert automaton.find_all('ushers') == [(1, 'she'), (2, 'he'),
+                                                (2, 'hers')]
+        assert automaton.find_all('ahishe') == [(1, 'his'), (3, 'she'),
+                                                (4, 'he')]
+        assert automaton.find_all('xyz') == []
+        assert automaton.find_all('') == []
+
+    def test_scan_across_chunks(self):
+        automaton = AhoCorasick.from_strings(['abc', 'bcd', 'c', 'abcde'])
+        text = 'xabcdeabc'
+        matches = automaton.find_all(text)
+        assert matches == [(1, 'abc'), (3, 'c'), (2, 'bcd'), (1, 'abcde'),
+                           (6, 'abc'), (8, 'c')]
+        chunks = ['xa', 'b', '', 'cdea', 'bc']
+        assert list(automaton.scan(iter(chunks))) == matches
+
+    def test_empty_string_is_not_reported(self):
+        automaton = AhoCorasick.from_strings(['', 'a'])
+        assert automaton.find_all('aba') == [(0, 'a'), (2, 'a')]
+
+    def test_radix_tree_is_rejected(self):
+        with self.assertRaises(ValueError):
+            AhoCorasick(RadixTree(['abc', 'abd']))
+        # A radix tree with only single-character labels is fine
+        automaton = AhoCorasick(RadixTree(['a', 'ab', 'b']))
+        assert automaton.find_all('ab') == [(0, 'a'), (0, 'ab'), (1, 'b')]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,259 @@
+#!python3
+
+from array import array
+import sys
+
+
+class ArrayPrefixTree:
+    """ArrayPrefixTree: A prefix tree with the same methods as PrefixTree that
+       stores all of its nodes in flat arrays instead of node objects.
+
+       Each node is an integer id that indexes into parallel arrays: the code
+       point of the node's character, the id of its first child and the id of
+       its next sibling (a child-edge table with -1 marking no edge), plus a
+       bitmap with one bit per node marking terminal nodes. Siblings are kept
+       in sorted order, so strings are retrieved in lexicographic order.
+
+       This costs a few bytes per node rather than a node object, a children
+       dictionary and a character string, at the price of scanning a node's
+       siblings (at most the size of the alphabet) to find a child.
+
+    """
+
+    # Constant for the start character stored in the prefix tree's root node
+    START_CHARACTER = ''
+    # Node id of the root node, and the id marking a missing child or sibling
+    ROOT = 0
+    NONE = -1
+
+    def __init__(self, strings=None):
+        """Initialize this prefix tree and insert the given strings, if any."""
+        # Code point of the character each node represents (0 for the root)
+        self.characters = array('I', [0])
+        # Child-edge table: each node's first child and next sibling node ids
+        self.first_child = array('i', [ArrayPrefixTree.NONE])
+        self.next_sibling = array('i', [ArrayPrefixTree.NONE])
+        # Bitmap with one bit per node, set if the node terminates a string
+        self.terminals = bytearray(1)
+        # Id of the root node
+        self.root = ArrayPrefixTree.ROOT
+        # Count the number of strings inserted into the tree
+        self.size = 0
+        # Insert each string, if any were given
+        if strings is not None:
+            for string in strings:
+                self.insert(string)
+
+    def __repr__(self):
+        """Return a string representation of this prefix tree."""
+        return f'ArrayPrefixTree({self.strings()!r})'
+
+    def is_empty(self):
+        """Return True if this prefix tree is empty (contains no strings)."""
+        return (self.size == 0)
+
+    def num_nodes(self):
+        """Return the number of nodes allocated in this prefix tree."""
+        return len(self.characters)
+
+    def is_terminal(self, node):
+        """Return True if the node with the given id terminates a string."""
+        return (self.terminals[node >> 3] >> (node & 7)) & 1 == 1
+
+    def _set_terminal(self, node, terminal):
+        """Set or clear the terminal bit of the node with the given id."""
+        if terminal is True:
+            self.terminals[node >> 3] |= 1 << (node & 7)
+        else:
+            self.terminals[node >> 3] &= ~(1 << (node & 7))
+
+    def get_child(self, node, character):
+        """Return the id of the child of the given node that represents the
+           given character, or NONE if the node has no such child.
+
+           Runtime Complexity:
+           O(b), where b is the number of children of the node, since
+           siblings are scanned in sorted order until the character is passed.
+
+        """
+        code = ord(character)
+        child = self.first_child[node]
+        while child != ArrayPrefixTree.NONE:
+            child_code = self.characters[child]
+            if child_code == code:
+                return child
+            if child_code > code:
+                break
+            child = self.next_sibling[child]
+        return ArrayPrefixTree.NONE
+
+    def _add_child(self, node, character):
+        """Allocate a new node for the given character, link it into the
+        sorted list of children of the given node and return its id."""
+        code = ord(character)
+        child = len(self.characters)
+        self.characters.append(code)
+        self.first_child.append(ArrayPrefixTree.NONE)
+        if child & 7 == 0:
+            self.terminals.append(0)
+        # Find the sibling that the new child should follow, if any
+        previous = ArrayPrefixTree.NONE
+        current = self.first_child[node]
+        while (current != ArrayPrefixTree.NONE and
+               self.characters[current] < code):
+            previous = current
+            current = self.next_sibling[current]
+        self.next_sibling.append(current)
+        if previous == ArrayPrefixTree.NONE:
+            self.first_child[node] = child
+        else:
+            self.next_sibling[previous] = child
+        return child
+
+    def contains(self, string):
+        """Return True if this prefix tree contains the given string.
+
+           Runtime Complexity:
+           O(m * b), where m is the length of the string and b is the largest
+           number of children scanned at a node along its path.
+
+        """
+        node, length = self._find_node(string)
+        return length == len(string) and self.is_terminal(node)
+
+    def insert(self, string):
+        """Insert the given string into this prefix tree.
+
+           Runtime Complexity:
+           O(m * b), where m is the length of the string and b is the largest
+           number of children scanned at a node along its path.
+
+        """
+        node, index = self._find_node(string)
+        for i in range(index, len(string)):
+            node = self._add_child(node, string[i])
+        if self.is_terminal(node) is False:
+            self._set_terminal(node, True)
+            self.size += 1
+
+    def _find_node(self, string):
+        """Return a pair containing the id of the deepest node in this prefix
+        tree that matches the longest prefix of the given string and the
+        node's depth (the number of prefix characters matched)."""
+        node = self.root
+        index = 0
+        while index < len(string):
+            child = self.get_child(node, string[index])
+            if child == ArrayPrefixTree.NONE:
+                break
+            node = child
+            index += 1
+        return node, index
+
+    def complete(self, prefix):
+        """Return a list of all strings stored in this prefix tree that start
+           with the given prefix string, in lexicographic order.
+
+           Runtime Complexity:
+           O(m * b + k), where m is the length of the prefix and k is the
+           number of nodes in the subtree below it.
+
+        """
+        completions = []
+        node, length = self._find_node(prefix)
+        if length == len(prefix):
+            self._traverse(node, prefix, completions.append)
+        return completions
+
+    def strings(self):
+        """Return a list of all strings stored in this prefix tree, in
+        lexicographic order."""
+        all_strings = []
+        self._traverse(self.root, '', all_strings.append)
+        return all_strings
+
+    def _traverse(self, node, prefix, visit):
+        """Traverse the subtree below the node with the given id in
+           depth-first order, using an explicit stack rather than recursion,
+           and visit each string it stores with the given visit function. The
+           given prefix represents the node's path in this prefix tree."""
+        path = list(prefix)
+        if self.is_terminal(node):
+            visit(prefix)
+        # Each stack entry is the next child id to visit at one depth, and the
+        # path holds the characters of the nodes above the deepest entry
+        stack = [self.first_child[node]]
+        while len(stack) > 0:
+            child = stack[-1]
+            if child == ArrayPrefixTree.NONE:
+                stack.pop()
+                if len(stack) > 0:
+                    path.pop()
+                continue
+            stack[-1] = self.next_sibling[child]
+            path.append(chr(self.characters[child]))
+            if self.is_terminal(child):
+                visit(''.join(path))
+            stack.append(self.first_child[child])
+
+    def delete(self, key):
+        """Remove the given key from this prefix tree by clearing the terminal
+           bit of its last node, or raise ValueError if it is not stored.
+           Node ids are never reused, so the arrays do not shrink.
+
+           Runtime Complexity:
+           O(m * b), where m is the length of the key.
+
+        """
+        node, length = self._find_node(key)
+        if length < len(key) or self.is_terminal(node) is False:
+            raise ValueError('Word is not found and cannot be deleted.')
+        self._set_terminal(node, False)
+        self.size -= 1
+
+    def memory_size(self):
+        """Return the number of bytes used by this prefix tree's arrays."""
+        return (sys.getsizeof(self.characters) +
+                sys.getsizeof(self.first_child) +
+                sys.getsizeof(self.next_sibling) +
+                sys.getsizeof(self.terminals))
+
+
+def node_memory_size(node):
+    """Return the number of bytes used by the given PrefixTreeNode and all of
+    the nodes below it, including their children dictionaries and characters.
+    Single-character strings are interned by Python, so they are not counted.
+    """
+    total = 0
+    stack = [node]
+    while len(stack) > 0:
+        node = stack.pop()
+        total += sys.getsizeof(node) + sys.getsizeof(node.children)
+        if hasattr(node, '__dict__'):
+            total += sys.getsizeof(node.__dict__)
+        if len(node.character) > 1:
+            total += sys.getsizeof(node.character)
+        stack.extend(node.children.values())
+    return total
+
+
+def main():
+    """Compare bytes per word of the node object and flat array layouts."""
+    from autocomplete import get_lines
+    from prefixtree import PrefixTree
+    words = get_lines(sys.argv[1]) if len(sys.argv) > 1 else get_lines()
+
+    tree = PrefixTree(words)
+    node_bytes = node_memory_size(tree.root)
+    array_tree = ArrayPrefixTree(words)
+    array_bytes = array_tree.memory_size()
+
+    print(f'Vocabulary size: {tree.size} words, '
+          f'{array_tree.num_nodes()} nodes')
+    print(f'PrefixTree:      {node_bytes / tree.size:8.1f} bytes per word')
+    print(f'ArrayPrefixTree: {array_bytes / array_tree.size:8.1f} bytes per '
+          f'word')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!python3
+
+from arrayprefixtree import ArrayPrefixTree
+from prefixtree import PrefixTree
+import unittest
+
+
+class ArrayPrefixTreeTest(unittest.TestCase):
+
+    def test_init_and_properties(self):
+        tree = ArrayPrefixTree()
+        assert tree.size == 0
+        assert tree.is_empty() is True
+        assert tree.num_nodes() == 1
+        assert tree.is_terminal(tree.root) is False
+
+    def test_insert_shares_prefix_nodes(self):
+        tree = ArrayPrefixTree()
+        tree.insert('ABC')
+        assert tree.num_nodes() == 4
+        tree.insert('ABD')
+        assert tree.num_nodes() == 5
+        # Inserting a prefix of a stored string only sets a terminal bit
+        tree.insert('A')
+        assert tree.num_nodes() == 5
+        # Repeated inserts do not change the size
+        tree.insert('ABC')
+        assert tree.size == 3
+
+    def test_contains(self):
+        tree = ArrayPrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        for string in ['ABC', 'ABD', 'A', 'XYZ']:
+            assert tree.contains(string) is True
+        for string in ['AB', 'BC', 'X', 'XY', 'Z', 'ABCD', '']:
+            assert tree.contains(string) is False
+
+    def test_complete_and_strings_are_sorted(self):
+        strings = ['XYZ', 'ABD', 'A', 'ABC', 'WAFFLE TIME']
+        tree = ArrayPrefixTree(strings)
+        assert tree.complete('A') == ['A', 'ABC', 'ABD']
+        assert tree.complete('AB') == ['ABC', 'ABD']
+        assert tree.complete('XY') == ['XYZ']
+        assert tree.complete('B') == []
+        assert tree.complete('AX') == []
+        assert tree.complete('') == sorted(strings)
+        assert tree.strings() == sorted(strings)
+
+    def test_same_results_as_prefix_tree(self):
+        strings = 'Peter Piper picked a peck of pickled peppers'.split()
+        tree = ArrayPrefixTree(strings)
+        prefix_tree = PrefixTree(strings)
+        for prefix in ['', 'P', 'p', 'pi', 'pe', 'pick', 'o', 'q']:
+            self.assertCountEqual(tree.complete(prefix),
+                                  prefix_tree.complete(prefix))
+
+    def test_delete(self):
+        tree = ArrayPrefixTree(['ABC', 'ABD', 'A'])
+        tree.delete('A')
+        assert tree.size == 2
+        assert tree.contains('A') is False
+        assert tree.complete('A') == ['ABC', 'ABD']
+        with self.assertRaises(ValueError):
+            tree.delete('A')
+        with self.assertRaises(ValueError):
+            tree.delete('AB')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,42 @@
 #!python
+import gzip
+import importlib
 import sys
 import time
 
+# File name extension of prefix trees saved by PrefixTree.save
+PREFIX_TREE_EXTENSION = '.trie'
+# First bytes of every gzip-compressed file
+GZIP_MAGIC = b'\x1f\x8b'
+
 
 def get_lines(filename='/usr/share/dict/words'):
     """Return a list of strings on separate lines in the given text file with
     any leading and trailing whitespace characters removed from each line."""
-    # Open file and remove whitespace from each line
-    with open(filename) as file:
-        lines = [line.strip() for line in file]
-    return lines
+    return list(iter_lines(filename))
+
+
+def iter_lines(filename='/usr/share/dict/words', normalize=None,
+               unique=False):
+    """Generate the strings on separate lines in the given text file, which
+    may be gzip-compressed, with any leading and trailing whitespace removed
+    and then normalized with the given function, if any (such as str.lower).
+    The file is read through a fixed-size buffer, so only one line at a time
+    is held in memory. If unique is True, skip each line that repeats the line
+    before it, which removes every repeat from a sorted file."""
+    with open(filename, 'rb') as file:
+        compressed = file.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+    opener = gzip.open if compressed else open
+    previous = None
+    with opener(filename, 'rt') as file:
+        for line in file:
+            line = line.strip()
+            if normalize is not None:
+                line = normalize(line)
+            if unique is True and line == previous:
+                continue
+            previous = line
+            yield line
 
 
 def generate_prefixes(vocabulary):
@@ -18,95 +45,257 @@ def generate_prefixes(vocabulary):
     return set(word[:len(word)//2] for word in vocabulary)
 
 
+class LinearSearch:
+    """LinearSearch: An autocomplete backend that keeps the vocabulary list
+    as given and checks every word for each prefix in O(n * m) time."""
+
+    def __init__(self, vocabulary):
+        """Initialize this backend with the given list of strings."""
+        self.vocabulary = vocabulary
+        self.size = len(vocabulary)
+
+    def complete(self, prefix):
+        """Return all words in the vocabulary that start with the prefix."""
+        return [word for word in self.vocabulary if word.startswith(prefix)]
+
+    def complete_many(self, prefixes):
+        """Return a dictionary that maps each of the given prefixes to all
+        words in the vocabulary that start with it."""
+        return {prefix: self.complete(prefix) for prefix in prefixes}
+
+
+# Registry of autocomplete backends: each algorithm name maps to the module
+# and name of a class (or other callable) that builds a structure from a
+# vocabulary list. Structures have a size attribute, a complete(prefix)
+# method and, optionally, a complete_many(prefixes) method that returns a
+# dictionary of the completions of each prefix.
+BACKENDS = {
+    'linear_search': (__name__, 'LinearSearch'),
+    'sorted_array': ('sortedvocabulary', 'SortedVocabulary'),
+    'trie': ('prefixtree', 'PrefixTree'),
+    'parallel_trie': ('prefixtree', 'PrefixTree.from_parallel'),
+    'radix_tree': ('prefixtree', 'RadixTree'),
+    'array_trie': ('arrayprefixtree', 'ArrayPrefixTree'),
+    'byte_trie': ('byteprefixtree', 'BytePrefixTree'),
+    'mapped_trie': ('mappedprefixtree', 'MappedPrefixTree.from_strings'),
+    'dawg': ('dawg', 'DAWG'),
+}
+
+
+def register_backend(algorithm, module, name):
+    """Register the class (or callable) with the given name in the given
+    module as the autocomplete backend for the given algorithm name. It is
+    only imported once the algorithm is set up."""
+    BACKENDS[algorithm] = (module, name)
+
+
+def get_backend(algorithm):
+    """Return the class (or callable) registered for the given algorithm, or
+    raise ValueError if no backend is registered for it."""
+    if algorithm not in BACKENDS:
+        raise ValueError('Unknown autocomplete algorithm {!r}, expected one '
+                         'of: {}'.format(algorithm, ', '.join(BACKENDS)))
+    module, name = BACKENDS[algorithm]
+    backend = importlib.import_module(module)
+    for attribute in name.split('.'):
+        backend = getattr(backend, attribute)
+    return backend
+
+
 def autocomplete_setup(vocabulary, algorithm='linear_search'):
     """Return the main data structure needed to set up autocomplete using the
     given vocabulary and algorithm, specified as linear_search, trie, etc."""
-    if algorithm == 'linear_search':
-        # Use the given vocabulary list
-        return vocabulary
-    elif algorithm == 'trie':
-        from trie import Trie
-        # Create a trie structure with the vocabulary
-        return Trie(vocabulary)
+    # Create the structure of the registered backend with the vocabulary
+    return get_backend(algorithm)(vocabulary)
+
+
+def autocomplete_stream(filename, algorithm='trie', normalize=None):
+    """Return the main data structure needed to set up autocomplete using the
+    given algorithm and the vocabulary in the given text file (which may be
+    gzip-compressed), inserting each line into the structure as it is read,
+    so memory is bounded by the structure rather than by the file. Structures
+    that strings cannot be inserted into are given the list of all lines, as
+    are structures that need sorted strings (like the dawg) if they reject
+    an unsorted file."""
+    lines = iter_lines(filename, normalize, unique=True)
+    backend = get_backend(algorithm)
+    if not (isinstance(backend, type) and hasattr(backend, 'insert')):
+        return backend(list(lines))
+    structure = backend()
+    try:
+        if hasattr(structure, 'extend') is True:
+            structure.extend(lines)
+        else:
+            for line in lines:
+                structure.insert(line)
+    except ValueError:
+        # Read the file again into a list that the structure can sort, which
+        # raises the error again if it was not about the order of the lines
+        return backend(list(iter_lines(filename, normalize, unique=True)))
+    if hasattr(structure, 'finish') is True:
+        structure.finish()
+    return structure
+
+
+def autocomplete_load(filename):
+    """Return a prefix tree structure for autocomplete that is memory-mapped
+    from the given file saved by PrefixTree.save, to use with the mapped_trie
+    algorithm without reading the vocabulary or rebuilding the tree."""
+    from prefixtree import PrefixTree
+    return PrefixTree.load(filename)
 
 
 def autocomplete(prefix, structure, algorithm='linear_search'):
     """Return all vocabulary entries that start with the given prefix using the
     given structure and algorithm, specified as linear_search, trie, etc."""
-    if algorithm == 'linear_search':
-        # Search the list using linear search
-        return [word for word in structure if word.startswith(prefix)]
-    elif algorithm == 'trie':
-        # Search the trie structure for the prefix
-        return structure.search(prefix)
+    # Every backend's structure completes prefixes the same way
+    return structure.complete(prefix)
+
+
+def autocomplete_many(prefixes, structure, algorithm='linear_search'):
+    """Return a dictionary that maps each of the given prefixes to all
+    vocabulary entries that start with it using the given structure and
+    algorithm. Prefix trees complete the whole batch with one shared walk."""
+    if hasattr(structure, 'complete_many'):
+        # Complete the sorted prefixes together, sharing nested results
+        return structure.complete_many(prefixes)
+    # Otherwise complete each prefix on its own
+    return {prefix: autocomplete(prefix, structure, algorithm)
+            for prefix in prefixes}
+
+
+def parse_algorithms(args):
+    """Remove an --algorithm option and its value from the given list of
+    command-line arguments and return the list of algorithm names it gives,
+    separated by commas, with 'all' naming every registered algorithm."""
+    algorithms = ['linear_search']
+    if '--algorithm' in args:
+        index = args.index('--algorithm')
+        if index + 1 == len(args):
+            raise ValueError('Option --algorithm needs a value')
+        value = args[index + 1]
+        del args[index:index + 2]
+        if value == 'all':
+            algorithms = list(BACKENDS)
+        else:
+            algorithms = value.split(',')
+        for algorithm in algorithms:
+            get_backend(algorithm)
+    return algorithms
 
 
 def main():
     """Read command-line arguments and test autocomplete algorithms."""
-    if len(sys.argv) == 1:
+    args = sys.argv[1:]
+    algorithms = parse_algorithms(args)
+    # Stream the vocabulary file into each structure instead of reading it
+    stream = '--stream' in args
+    if stream is True:
+        args.remove('--stream')
+    # Print statistics of each structure that reports them, as JSON
+    show_stats = '--stats' in args
+    if show_stats is True:
+        args.remove('--stats')
+    if len(args) == 0:
         script = sys.argv[0]  # Get script file name
-        print('Usage: {} prefix'.format(script))
+        print('Usage: {} [--algorithm name] prefix'.format(script))
         print('Test autocomplete with dictionary words and the given prefix')
         print('Example: {} axl'.format(script))
         print('Completions of axl: axle, axled, axlesmith, axletree')
         print()
-        print('Usage: {} prefixes-file vocabulary-file'.format(script))
+        print('Usage: {} [--algorithm name] [--stream] [--stats] '
+              'prefixes-file vocabulary-file'.format(script))
         print('Test autocomplete with the given prefixes and vocabulary files')
         print('Example: {} prefixes.txt /usr/share/dict/words'.format(script))
+        print('A vocabulary file may be gzip-compressed, and with --stream '
+              'it is inserted line by line without reading it into a list')
+        print('With --stats, print the shape and memory statistics of each '
+              'structure that has a stats_json method')
+        print('A vocabulary file ending in {} is memory-mapped as a prefix '
+              'tree saved by PrefixTree.save'.format(PREFIX_TREE_EXTENSION))
+        print()
+        print('Algorithms: {} (default: linear_search)'
+              .format(', '.join(BACKENDS)))
+        print('Compare several with --algorithm name,name,... or all')
         return
 
-    elif len(sys.argv) == 2:
+    elif len(args) == 1:
         # Test autocomplete with dictionary words and the given prefix
-        prefix = sys.argv[1]
+        prefix = args[0]
         vocabulary = get_lines('/usr/share/dict/words')
+        print('Vocabulary size: {}'.format(len(vocabulary)))
 
-        # Start the clock for benchmarking
-        start_time = time.time()
+        for algorithm in algorithms:
+            # Start the clock for benchmarking
+            start_time = time.time()
 
-        # Set up autocomplete and mark the clock
-        structure = autocomplete_setup(vocabulary)
-        setup_time = time.time()
+            # Set up autocomplete and mark the clock
+            structure = autocomplete_setup(vocabulary, algorithm)
+            setup_time = time.time()
 
-        # Run autocomplete and mark the clock
-        completions = autocomplete(prefix, structure)
-        end_time = time.time()
+            # Run autocomplete and mark the clock
+            completions = autocomplete(prefix, structure, algorithm)
+            end_time = time.time()
 
-        print('Vocabulary size: {}'.format(len(vocabulary)))
-        print('Completions of {}: {}'.format(prefix, ', '.join(completions)))
-        print()
-        print('Initial setup time: {:.6f} sec'.format(setup_time - start_time))
-        print('Autocomplete time:  {:.6f} sec'.format(end_time - setup_time))
-        print('Total time elapsed: {:.6f} sec'.format(end_time - start_time))
+            print()
+            print('Algorithm: {}'.format(algorithm))
+            print('Completions of {}: {}'.format(prefix,
+                                                 ', '.join(completions)))
+            print_times(start_time, setup_time, end_time)
 
-    elif len(sys.argv) == 3:
-        # Open the given vocabulary and prefixes files
-        vocabulary = get_lines(sys.argv[2])
-        prefixes = get_lines(sys.argv[1])
+    elif len(args) == 2:
+        # Open the given prefixes file
+        prefixes = get_lines(args[0])
 
-        # Start the clock for benchmarking
-        start_time = time.time()
+        if args[1].endswith(PREFIX_TREE_EXTENSION):
+            # Map the saved prefix tree instead of reading the vocabulary
+            algorithms = ['mapped_trie']
+            vocabulary = None
+        elif stream is True:
+            vocabulary = None
+        else:
+            vocabulary = get_lines(args[1])
 
-        # Set up autocomplete and mark the clock
-        structure = autocomplete_setup(vocabulary)
-        setup_time = time.time()
+        for algorithm in algorithms:
+            # Start the clock for benchmarking
+            start_time = time.time()
 
-        # Run autocomplete with each prefix
-        num_completions = 0
-        for prefix in prefixes:
-            completions = autocomplete(prefix, structure)
-            num_completions += len(completions)
-            # print('Completions of {}: {}'.format(prefix, ', '.join(completions)))
+            # Set up autocomplete and mark the clock
+            if args[1].endswith(PREFIX_TREE_EXTENSION):
+                structure = autocomplete_load(args[1])
+            elif vocabulary is None:
+                structure = autocomplete_stream(args[1], algorithm)
+            else:
+                structure = autocomplete_setup(vocabulary, algorithm)
+            setup_time = time.time()
 
-        # Mark the clock
-        end_time = time.time()
+            # Run autocomplete with all prefixes at once
+            num_completions = 0
+            batch = autocomplete_many(prefixes, structure, algorithm)
+            for prefix in prefixes:
+                completions = batch[prefix]
+                num_completions += len(completions)
+                # print('Completions of {}: {}'.format(prefix, ', '.join(completions)))
 
-        print('Vocabulary size: {}'.format(len(vocabulary)))
-        print('Found {} total completions of {} prefixes'
-              .format(num_completions, len(prefixes)))
-        print()
-        print('Initial setup time: {:.6f} sec'.format(setup_time - start_time))
-        print('Autocomplete time:  {:.6f} sec'.format(end_time - setup_time))
-        print('Total time elapsed: {:.6f} sec'.format(end_time - start_time))
+            # Mark the clock
+            end_time = time.time()
+
+            print('Algorithm: {}'.format(algorithm))
+            print('Vocabulary size: {}'.format(structure.size))
+            print('Found {} total completions of {} prefixes'
+                  .format(num_completions, len(prefixes)))
+            print_times(start_time, setup_time, end_time)
+            if show_stats is True and hasattr(structure, 'stats_json'):
+                print('Statistics: {}'.format(structure.stats_json(indent=2)))
+            print()
+
+
+def print_times(start_time, setup_time, end_time):
+    """Print the setup, autocomplete and total times between the given
+    start, setup and end times."""
+    print('Initial setup time: {:.6f} sec'.format(setup_time - start_time))
+    print('Autocomplete time:  {:.6f} sec'.format(end_time - setup_time))
+    print('Total time elapsed: {:.6f} sec'.format(end_time - start_time))
 
 
 if __name__ == '__main__':
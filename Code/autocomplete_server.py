@@ -0,0 +1,197 @@
+#!python
+import asyncio
+import json
+import sys
+import time
+
+from autocomplete import (PREFIX_TREE_EXTENSION, autocomplete,
+                          autocomplete_load, autocomplete_setup, get_lines)
+
+# Default host and port of the server, and how long in seconds a lookup of a
+# prefix waits for identical requests to arrive before it is run
+HOST = '127.0.0.1'
+PORT = 8765
+COALESCE_WINDOW = 0.001
+
+
+class AutocompleteServer:
+    """AutocompleteServer: A long-lived asyncio server that holds one
+       autocomplete structure in memory and answers newline-delimited prefix
+       queries with one line each, holding a JSON list of completions.
+
+       Identical prefixes requested by any connection within a short window
+       are coalesced: the first request schedules one lookup after the window
+       and every request for the same prefix until then awaits its result.
+
+    """
+
+    def __init__(self, structure, algorithm='trie', window=COALESCE_WINDOW):
+        """Initialize this server with the given structure set up for the
+        given algorithm and the given coalescing window in seconds."""
+        self.structure = structure
+        self.algorithm = algorithm
+        self.window = window
+        # Futures of the lookups waiting to run, keyed by prefix
+        self.pending = {}
+        # Count the number of requests and of lookups actually run
+        self.requests = 0
+        self.lookups = 0
+
+    async def complete(self, prefix):
+        """Return the completions of the given prefix, sharing one lookup
+        with every other request for the prefix within the window."""
+        self.requests += 1
+        future = self.pending.get(prefix)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self.pending[prefix] = future
+            loop.call_later(self.window, self._lookup, prefix)
+        # Shield the shared future so a cancelled request does not cancel it
+        return await asyncio.shield(future)
+
+    def _lookup(self, prefix):
+        """Run the lookup of the given prefix and resolve its future."""
+        future = self.pending.pop(prefix)
+        self.lookups += 1
+        try:
+            future.set_result(autocomplete(prefix, self.structure,
+                                           self.algorithm))
+        except Exception as error:
+            future.set_exception(error)
+
+    async def handle(self, reader, writer):
+        """Answer each line read from the given connection with a line of the
+        completions of the prefix on it, until the connection is closed."""
+        try:
+            while True:
+                line = await reader.readline()
+                if len(line) == 0:
+                    break
+                prefix = line.decode('utf-8').rstrip('\r\n')
+                completions = await self.complete(prefix)
+                writer.write(json.dumps(completions).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, address=None):
+        """Start serving on the given address, which is a (host, port) pair
+        for TCP or a path for a Unix socket, and return the asyncio server."""
+        if address is None:
+            address = (HOST, PORT)
+        if isinstance(address, str):
+            return await asyncio.start_unix_server(self.handle, address)
+        host, port = address
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def open_connection(address):
+    """Return a (reader, writer) pair connected to the given address, which
+    is a (host, port) pair for TCP or a path for a Unix socket."""
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+async def run_load(address, prefixes, connections=10, requests=1000):
+    """Send the given number of requests, cycling through the given prefixes,
+    over the given number of concurrent connections to the server at the
+    given address, and return a pair of the list of request latencies in
+    seconds and the total time elapsed."""
+    latencies = []
+    # Each connection sends its share of the requests one after another
+    shares = [range(index, requests, connections)
+              for index in range(connections)]
+
+    async def client(share):
+        reader, writer = await open_connection(address)
+        try:
+            for index in share:
+                prefix = prefixes[index % len(prefixes)]
+                start_time = time.perf_counter()
+                writer.write(prefix.encode('utf-8') + b'\n')
+                await writer.drain()
+                await reader.readline()
+                latencies.append(time.perf_counter() - start_time)
+        finally:
+            writer.close()
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(client(share) for share in shares))
+    return latencies, time.perf_counter() - start_time
+
+
+def percentile(values, percent):
+    """Return the given percentile of the given list of values, using the
+    nearest-rank method."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def parse_address(argument):
+    """Return the (host, port) pair of the given port number argument, or
+    the argument itself as the path of a Unix socket."""
+    if argument.isdigit():
+        return (HOST, int(argument))
+    return argument
+
+
+async def serve(vocabulary_file, address):
+    """Set up autocomplete with the given vocabulary file, or map the prefix
+    tree saved in it, and serve queries on the given address forever."""
+    start_time = time.time()
+    if vocabulary_file.endswith(PREFIX_TREE_EXTENSION):
+        algorithm = 'mapped_trie'
+        structure = autocomplete_load(vocabulary_file)
+    else:
+        algorithm = 'trie'
+        structure = autocomplete_setup(get_lines(vocabulary_file), algorithm)
+    server = AutocompleteServer(structure, algorithm)
+    listener = await server.start(address)
+    print('Vocabulary size: {}'.format(structure.size))
+    print('Initial setup time: {:.6f} sec'.format(time.time() - start_time))
+    print('Serving on {}'.format(address))
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    """Read command-line arguments to run the server or the load generator."""
+    if len(sys.argv) < 3 or sys.argv[1] not in ('serve', 'bench'):
+        script = sys.argv[0]  # Get script file name
+        print('Usage: {} serve vocabulary-file [port-or-socket]'
+              .format(script))
+        print('Serve autocomplete queries, one prefix per line')
+        print()
+        print('Usage: {} bench prefixes-file [port-or-socket] [connections] '
+              '[requests]'.format(script))
+        print('Benchmark a running server with the given prefixes')
+        print('Example: {} bench prefixes15.txt {} 10 10000'
+              .format(script, PORT))
+        return
+    address = parse_address(sys.argv[3]) if len(sys.argv) > 3 else (HOST,
+                                                                      PORT)
+    if sys.argv[1] == 'serve':
+        try:
+            asyncio.run(serve(sys.argv[2], address))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    prefixes = get_lines(sys.argv[2])
+    connections = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+    requests = int(sys.argv[5]) if len(sys.argv) > 5 else 1000
+    latencies, elapsed = asyncio.run(run_load(address, prefixes, connections,
+                                              requests))
+    print('Requests: {} over {} connections'.format(requests, connections))
+    print('Throughput: {:.1f} queries/sec'.format(requests / elapsed))
+    print('Latency p50: {:.3f} ms'.format(percentile(latencies, 50) * 1000))
+    print('Latency p99: {:.3f} ms'.format(percentile(latencies, 99) * 1000))
+
+
+if __name__ == '__main__':
+    main()
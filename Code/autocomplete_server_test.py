@@ -0,0 +1,61 @@
+#!python3
+
+from autocomplete_server import AutocompleteServer, percentile, run_load
+from prefixtree import PrefixTree
+import asyncio
+import json
+import unittest
+
+
+class AutocompleteServerTest(unittest.TestCase):
+
+    def test_coalesce_identical_prefixes(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        server = AutocompleteServer(tree)
+
+        async def requests():
+            return await asyncio.gather(server.complete('AB'),
+                                        server.complete('AB'),
+                                        server.complete('X'),
+                                        server.complete('AB'))
+
+        results = asyncio.run(requests())
+        assert [sorted(result) for result in results] == [
+            ['ABC', 'ABD'], ['ABC', 'ABD'], ['XYZ'], ['ABC', 'ABD']]
+        assert server.requests == 4
+        # One lookup for the three requests for 'AB' and one for 'X'
+        assert server.lookups == 2
+        assert server.pending == {}
+
+    def test_serve_and_load(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        server = AutocompleteServer(tree)
+
+        async def session():
+            listener = await server.start(('127.0.0.1', 0))
+            address = listener.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(*address)
+            writer.write(b'AB\nQ\n')
+            lines = [await reader.readline(), await reader.readline()]
+            writer.close()
+            latencies, elapsed = await run_load(address, ['A', 'X'], 4, 20)
+            listener.close()
+            await listener.wait_closed()
+            return lines, latencies
+
+        lines, latencies = asyncio.run(session())
+        assert sorted(json.loads(lines[0])) == ['ABC', 'ABD']
+        assert json.loads(lines[1]) == []
+        assert len(latencies) == 20
+        assert server.requests == 22
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+        assert percentile([7], 99) == 7
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#!python3
+
+from autocomplete import (BACKENDS, LinearSearch, autocomplete,
+                          autocomplete_many, autocomplete_setup,
+                          autocomplete_stream, get_backend, get_lines,
+                          iter_lines, parse_algorithms, register_backend)
+from dawg import DAWG
+from prefixtree import PrefixTree, RadixTree
+import gzip
+import os
+import tempfile
+import unittest
+
+
+class BackendRegistryTest(unittest.TestCase):
+
+    def test_get_backend(self):
+        assert get_backend('linear_search') is LinearSearch
+        assert get_backend('trie') is PrefixTree
+        assert get_backend('radix_tree') is RadixTree
+        # Verify dotted names resolve to attributes of classes
+        assert get_backend('parallel_trie') == PrefixTree.from_parallel
+        with self.assertRaises(ValueError):
+            get_backend('no_such_algorithm')
+
+    def test_register_backend(self):
+        register_backend('custom_radix', 'prefixtree', 'RadixTree')
+        try:
+            assert get_backend('custom_radix') is RadixTree
+            structure = autocomplete_setup(['ABC', 'A'], 'custom_radix')
+            assert autocomplete('AB', structure) == ['ABC']
+        finally:
+            del BACKENDS['custom_radix']
+        # Verify a backend is only imported once it is set up
+        register_backend('missing', 'no_such_module', 'Missing')
+        try:
+            with self.assertRaises(ImportError):
+                get_backend('missing')
+        finally:
+            del BACKENDS['missing']
+
+    def test_parse_algorithms(self):
+        args = ['prefixes.txt', 'words.txt']
+        assert parse_algorithms(args) == ['linear_search']
+        assert args == ['prefixes.txt', 'words.txt']
+        args = ['--algorithm', 'trie,dawg', 'prefixes.txt']
+        assert parse_algorithms(args) == ['trie', 'dawg']
+        assert args == ['prefixes.txt']
+        args = ['axl', '--algorithm', 'all']
+        assert parse_algorithms(args) == list(BACKENDS)
+        assert args == ['axl']
+        with self.assertRaises(ValueError):
+            parse_algorithms(['axl', '--algorithm'])
+        with self.assertRaises(ValueError):
+            parse_algorithms(['--algorithm', 'trie,no_such_algorithm'])
+
+    def test_every_backend_completes_the_same(self):
+        vocabulary = sorted(['A', 'ABC', 'ABD', 'ABDE', 'XY', 'XYZ', 'café',
+                             'cafés', 'WAFFLE TIME'])
+        prefixes = ['', 'A', 'AB', 'ABD', 'X', 'caf', 'W', 'Q', 'ABDEF']
+        expected = {prefix: [word for word in vocabulary
+                             if word.startswith(prefix)]
+                    for prefix in prefixes}
+        for algorithm in BACKENDS:
+            structure = autocomplete_setup(vocabulary, algorithm)
+            assert structure.size == len(vocabulary), algorithm
+            for prefix in prefixes:
+                assert (autocomplete(prefix, structure, algorithm) ==
+                        expected[prefix]), (algorithm, prefix)
+            assert (autocomplete_many(prefixes, structure, algorithm) ==
+                    expected), algorithm
+
+
+class IngestionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def write(self, name, text, compress=False):
+        """Write the given text to a file with the given name in the test
+        directory, gzip-compressed if compress is True, and return its
+        path."""
+        filename = os.path.join(self.directory, name)
+        with (gzip.open if compress else open)(filename, 'wt') as file:
+            file.write(text)
+        return filename
+
+    def test_iter_lines_plain_and_gzip(self):
+        text = '  Apple\nbanana \n\tcherry\n'
+        for compress in [False, True]:
+            # Verify gzip is detected by its magic bytes, not the file name
+            filename = self.write(f'words{compress}.txt', text, compress)
+            assert list(iter_lines(filename)) == ['Apple', 'banana', 'cherry']
+            assert get_lines(filename) == ['Apple', 'banana', 'cherry']
+
+    def test_iter_lines_normalize_and_unique(self):
+        filename = self.write('words.txt', 'a\nA\na\nb\nb \nA\n')
+        assert list(iter_lines(filename, normalize=str.lower)) == \
+            ['a', 'a', 'a', 'b', 'b', 'a']
+        # Verify only lines that repeat the line before them are skipped
+        assert list(iter_lines(filename, unique=True)) == \
+            ['a', 'A', 'a', 'b', 'A']
+        assert list(iter_lines(filename, str.lower, unique=True)) == \
+            ['a', 'b', 'a']
+
+    def test_autocomplete_stream(self):
+        words = ['cab', 'abc', 'ab', 'abd', 'b', 'ABD']
+        filename = self.write('words.txt', '\n'.join(words) + '\n', True)
+        expected = sorted(words)
+        for algorithm in ['trie', 'radix_tree', 'array_trie', 'byte_trie',
+                          'sorted_array', 'mapped_trie', 'linear_search']:
+            structure = autocomplete_stream(filename, algorithm)
+            assert structure.size == len(words), algorithm
+            assert sorted(structure.complete('')) == expected, algorithm
+            assert sorted(structure.complete('ab')) == \
+                ['ab', 'abc', 'abd'], algorithm
+        structure = autocomplete_stream(filename, 'trie', str.lower)
+        assert structure.strings() == ['ab', 'abc', 'abd', 'b', 'cab']
+
+    def test_autocomplete_stream_dawg(self):
+        # Verify a sorted file is inserted line by line and then finished
+        filename = self.write('sorted.txt', 'ab\nabc\nb\nb\n')
+        structure = autocomplete_stream(filename, 'dawg')
+        assert isinstance(structure, DAWG)
+        assert structure.finished is True
+        assert structure.strings() == ['ab', 'abc', 'b']
+        # Verify an unsorted file falls back to sorting all of its lines
+        filename = self.write('unsorted.txt', 'b\nab\nabc\n')
+        structure = autocomplete_stream(filename, 'dawg')
+        assert structure.finished is True
+        assert structure.strings() == ['ab', 'abc', 'b']
+
+
+if __name__ == '__main__':
+    unittest.main()
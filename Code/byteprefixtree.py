@@ -0,0 +1,338 @@
+#!python3
+
+import sys
+
+
+class BitmapNode:
+    """BitmapNode: A node of a byte prefix tree that keeps its children in a
+       list in byte order, with a 256-bit bitmap of the bytes that have a
+       child. The index of a child in the list is the number of bits set in
+       the bitmap below its byte, so a node only holds as many slots as it has
+       children.
+
+    """
+    __slots__ = ('bitmap', 'children', 'terminal')
+
+    def __init__(self):
+        """Initialize this node with no children and not terminal."""
+        # Bit b is set if there is a child for byte b
+        self.bitmap = 0
+        # Children in byte order
+        self.children = []
+        # Marks if this node terminates a string
+        self.terminal = False
+
+    def num_children(self):
+        """Return the number of children of this node."""
+        return len(self.children)
+
+    def get_child(self, byte):
+        """Return the child of this node for the given byte, or None.
+
+           Runtime Complexity: O(1), counting the bits set below the byte.
+
+        """
+        bit = 1 << byte
+        if self.bitmap & bit == 0:
+            return None
+        return self.children[(self.bitmap & (bit - 1)).bit_count()]
+
+    def add_child(self, byte, child):
+        """Add the given child for the given byte, which has no child yet.
+
+           Runtime Complexity: O(b) for a node with b children.
+
+        """
+        bit = 1 << byte
+        self.children.insert((self.bitmap & (bit - 1)).bit_count(), child)
+        self.bitmap |= bit
+
+    def remove_child(self, byte):
+        """Remove the child of this node for the given byte.
+
+           Runtime Complexity: O(b) for a node with b children.
+
+        """
+        bit = 1 << byte
+        del self.children[(self.bitmap & (bit - 1)).bit_count()]
+        self.bitmap &= ~bit
+
+    def items(self):
+        """Return a list of (byte, child) pairs of this node in byte order."""
+        pairs = []
+        bitmap = self.bitmap
+        for child in self.children:
+            # Take the lowest bit set and clear it
+            pairs.append(((bitmap & -bitmap).bit_length() - 1, child))
+            bitmap &= bitmap - 1
+        return pairs
+
+    def memory_size(self):
+        """Return the number of bytes used by this node, its bitmap and its
+        list of children."""
+        return (sys.getsizeof(self) + sys.getsizeof(self.bitmap) +
+                sys.getsizeof(self.children))
+
+
+class DenseNode:
+    """DenseNode: A node of a byte prefix tree that keeps its children in a
+       list of 256 slots indexed by byte, so finding a child is a single
+       index. Nodes without children all share one read-only tuple of empty
+       slots, and get their own list when their first child is added.
+
+    """
+    __slots__ = ('children', 'terminal')
+
+    # Slots of every node that has no children
+    EMPTY = (None,) * 256
+
+    def __init__(self):
+        """Initialize this node with no children and not terminal."""
+        # Child for each byte, or None
+        self.children = DenseNode.EMPTY
+        # Marks if this node terminates a string
+        self.terminal = False
+
+    def num_children(self):
+        """Return the number of children of this node."""
+        if self.children is DenseNode.EMPTY:
+            return 0
+        return 256 - self.children.count(None)
+
+    def get_child(self, byte):
+        """Return the child of this node for the given byte, or None.
+
+           Runtime Complexity: O(1)
+
+        """
+        return self.children[byte]
+
+    def add_child(self, byte, child):
+        """Add the given child for the given byte, which has no child yet.
+
+           Runtime Complexity: O(1), or O(256) for the first child.
+
+        """
+        if self.children is DenseNode.EMPTY:
+            self.children = list(DenseNode.EMPTY)
+        self.children[byte] = child
+
+    def remove_child(self, byte):
+        """Remove the child of this node for the given byte.
+
+           Runtime Complexity: O(1)
+
+        """
+        self.children[byte] = None
+
+    def items(self):
+        """Return a list of (byte, child) pairs of this node in byte order."""
+        if self.children is DenseNode.EMPTY:
+            return []
+        return [(byte, child) for byte, child in enumerate(self.children)
+                if child is not None]
+
+    def memory_size(self):
+        """Return the number of bytes used by this node and its own list of
+        children, if it has one."""
+        if self.children is DenseNode.EMPTY:
+            return sys.getsizeof(self)
+        return sys.getsizeof(self) + sys.getsizeof(self.children)
+
+
+class BytePrefixTree:
+    """BytePrefixTree: A prefix tree that stores strings encoded as UTF-8, one
+       byte per node, so every node has at most 256 children, which are kept
+       in an array of slots indexed by byte (dense) or in a compact list
+       indexed by counting the bits of a bitmap below the byte (bitmap, the
+       default) rather than in a dictionary.
+
+       Finding a child never hashes a key, but characters outside ASCII take
+       two to four nodes each. UTF-8 byte order is code point order, so
+       strings are retrieved in lexicographic order.
+
+    """
+
+    def __init__(self, strings=None, dense=False):
+        """Initialize this prefix tree with dense or bitmap nodes and insert
+        the given strings, if any."""
+        self.node_class = DenseNode if dense is True else BitmapNode
+        self.root = self.node_class()
+        # Count the number of strings inserted into the tree
+        self.size = 0
+        if strings is not None:
+            for string in strings:
+                self.insert(string)
+
+    def __repr__(self):
+        """Return a string representation of this prefix tree."""
+        return f'BytePrefixTree({self.strings()!r})'
+
+    def is_empty(self):
+        """Return True if this prefix tree is empty (contains no strings)."""
+        return (self.size == 0)
+
+    def _find_node(self, data):
+        """Return the node at the end of the path of the given bytes, or None
+           if there is no such path.
+
+           Runtime Complexity: O(m) for m bytes.
+
+        """
+        node = self.root
+        for byte in data:
+            node = node.get_child(byte)
+            if node is None:
+                return None
+        return node
+
+    def contains(self, string):
+        """Return True if this prefix tree contains the given string.
+
+           Runtime Complexity: O(m) for a string of m bytes in UTF-8.
+
+        """
+        node = self._find_node(string.encode('utf-8'))
+        return node is not None and node.terminal is True
+
+    def insert(self, string):
+        """Insert the given string into this prefix tree.
+
+           Runtime Complexity:
+           O(m * b) for a string of m bytes in UTF-8, where b is the number of
+           children of a bitmap node a child is added to, or O(m) with dense
+           nodes.
+
+        """
+        node = self.root
+        for byte in string.encode('utf-8'):
+            child = node.get_child(byte)
+            if child is None:
+                child = self.node_class()
+                node.add_child(byte, child)
+            node = child
+        if node.terminal is False:
+            node.terminal = True
+            self.size += 1
+
+    def delete(self, key):
+        """Remove the given key from this prefix tree and prune the nodes
+           that no longer lead to any string, or raise ValueError if the key
+           is not stored.
+
+           Runtime Complexity: O(m * b) for a key of m bytes in UTF-8.
+
+        """
+        data = key.encode('utf-8')
+        path = [self.root]
+        for byte in data:
+            child = path[-1].get_child(byte)
+            if child is None:
+                break
+            path.append(child)
+        if len(path) < len(data) + 1 or path[-1].terminal is False:
+            raise ValueError('Word is not found and cannot be deleted.')
+        path[-1].terminal = False
+        self.size -= 1
+        depth = len(data)
+        while (depth > 0 and path[depth].terminal is False and
+               path[depth].num_children() == 0):
+            path[depth - 1].remove_child(data[depth - 1])
+            depth -= 1
+
+    def complete(self, prefix):
+        """Return a list of all strings stored in this prefix tree that start
+           with the given prefix string, in lexicographic order.
+
+           Runtime Complexity:
+           O(m + k), where m is the number of bytes of the prefix and k is the
+           number of nodes in the subtree below it.
+
+        """
+        data = prefix.encode('utf-8')
+        node = self._find_node(data)
+        if node is None:
+            return []
+        completions = []
+        path = bytearray(data)
+        # Each stack entry is the pending (byte, child) pairs of a node on
+        # the current path, in reverse order
+        if node.terminal is True:
+            completions.append(prefix)
+        stack = [node.items()[::-1]]
+        while len(stack) > 0:
+            pending = stack[-1]
+            if len(pending) == 0:
+                stack.pop()
+                del path[-1:]
+                continue
+            byte, child = pending.pop()
+            path.append(byte)
+            if child.terminal is True:
+                completions.append(path.decode('utf-8'))
+            stack.append(child.items()[::-1])
+        return completions
+
+    def strings(self):
+        """Return a list of all strings stored in this prefix tree, in
+        lexicographic order."""
+        return self.complete('')
+
+    def nodes(self):
+        """Return a list of all nodes in this prefix tree."""
+        nodes = [self.root]
+        for node in nodes:
+            nodes.extend(child for byte, child in node.items())
+        return nodes
+
+    def num_nodes(self):
+        """Return the number of nodes in this prefix tree."""
+        return len(self.nodes())
+
+    def memory_size(self):
+        """Return the number of bytes used by this prefix tree's nodes."""
+        return sum(node.memory_size() for node in self.nodes())
+
+
+def unicode_variant(words):
+    """Return a list of the given words with each character replaced by one
+    in the Cyrillic block, so every character takes two bytes in UTF-8."""
+    shift = {code: 0x0400 + code for code in range(0x80)}
+    return [word.translate(shift) for word in words]
+
+
+def main():
+    """Compare the memory and lookup speed of a PrefixTree with dictionary
+    children and of BytePrefixTrees with bitmap and dense children, on an
+    ASCII vocabulary and on the same words in another script."""
+    import time
+    from arrayprefixtree import node_memory_size
+    from autocomplete import get_lines
+    from prefixtree import PrefixTree
+    words = get_lines(sys.argv[1]) if len(sys.argv) > 1 else get_lines()
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    # Dense nodes take 2 KB each, so only use an even sample of the words
+    words = words[::max(1, len(words) // limit)]
+
+    for name, vocabulary in [('ASCII', words),
+                             ('Unicode', unicode_variant(words))]:
+        print(f'{name} vocabulary: {len(set(vocabulary))} words')
+        trees = [('PrefixTree (dict)', PrefixTree(vocabulary)),
+                 ('BytePrefixTree (bitmap)', BytePrefixTree(vocabulary)),
+                 ('BytePrefixTree (dense)', BytePrefixTree(vocabulary, True))]
+        for tree_name, tree in trees:
+            if isinstance(tree, PrefixTree):
+                memory = node_memory_size(tree.root)
+            else:
+                memory = tree.memory_size()
+            start_time = time.time()
+            for word in vocabulary:
+                tree.contains(word)
+            lookup_time = time.time() - start_time
+            print(f'  {tree_name:24} {memory / tree.size:9.1f} bytes per '
+                  f'word, {lookup_time * 1e6 / len(vocabulary):6.2f} '
+                  f'usec per lookup')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!python3
+
+from byteprefixtree import BitmapNode, BytePrefixTree, DenseNode
+import unittest
+
+
+class BytePrefixTreeTest(unittest.TestCase):
+
+    def test_bitmap_node(self):
+        node = BitmapNode()
+        children = {byte: BitmapNode() for byte in [200, 3, 65, 255, 0]}
+        for byte, child in children.items():
+            node.add_child(byte, child)
+        assert node.num_children() == 5
+        for byte, child in children.items():
+            assert node.get_child(byte) is child
+        assert node.get_child(66) is None
+        assert node.items() == sorted(children.items())
+        node.remove_child(65)
+        assert node.get_child(65) is None
+        assert node.get_child(200) is children[200]
+        assert [byte for byte, child in node.items()] == [0, 3, 200, 255]
+
+    def test_dense_node(self):
+        node = DenseNode()
+        assert node.children is DenseNode.EMPTY
+        assert node.items() == []
+        child = DenseNode()
+        node.add_child(97, child)
+        assert node.get_child(97) is child
+        assert node.num_children() == 1
+        assert child.children is DenseNode.EMPTY
+        node.remove_child(97)
+        assert node.get_child(97) is None
+
+    def test_insert_contains_and_complete(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ', 'Äb', 'Äbc', '日本', '日本語', '']
+        for dense in [False, True]:
+            tree = BytePrefixTree(strings, dense)
+            assert tree.size == len(strings)
+            for string in strings:
+                assert tree.contains(string) is True
+            for string in ['AB', 'Ä', '日', 'XYZZ', 'B']:
+                assert tree.contains(string) is False
+            assert tree.complete('A') == ['A', 'ABC', 'ABD']
+            assert tree.complete('Äb') == ['Äb', 'Äbc']
+            assert tree.complete('日') == ['日本', '日本語']
+            assert tree.complete('Q') == []
+            assert tree.strings() == sorted(strings)
+            # Verify characters take one node per UTF-8 byte
+            assert tree.num_nodes() == 1 + 3 + 1 + 3 + 4 + 9
+
+    def test_delete(self):
+        for dense in [False, True]:
+            tree = BytePrefixTree(['ABC', 'ABD', 'A', 'Äbc'], dense)
+            tree.delete('ABC')
+            tree.delete('Äbc')
+            assert tree.size == 2
+            assert tree.strings() == ['A', 'ABD']
+            assert tree.num_nodes() == 4
+            with self.assertRaises(ValueError):
+                tree.delete('AB')
+            with self.assertRaises(ValueError):
+                tree.delete('Äbc')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!python3
+
+from collections import OrderedDict
+
+
+class CompletionCache:
+    """CompletionCache: A bounded cache of completion results keyed by prefix
+       (and the number of results requested), which evicts the least recently
+       used results when it is full.
+
+       Results are also indexed by prefix, so that when a string is inserted
+       into or deleted from a prefix tree, only the results for prefixes of
+       that string, whose completions may have changed, are invalidated.
+       Counters of hits, misses, evictions and invalidations help to choose a
+       capacity.
+
+    """
+
+    def __init__(self, capacity):
+        """Initialize this cache to hold at most the given number of results,
+        or raise ValueError if the capacity is not positive."""
+        if capacity <= 0:
+            raise ValueError(f'Cache capacity must be positive: {capacity}')
+        self.capacity = capacity
+        # Results keyed by (prefix, k) pairs, from least to most recently used
+        self.results = OrderedDict()
+        # Sets of the k values cached for each prefix
+        self.prefixes = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __repr__(self):
+        """Return a string representation of this cache."""
+        return f'CompletionCache({self.capacity!r})'
+
+    def __len__(self):
+        """Return the number of results held in this cache."""
+        return len(self.results)
+
+    def get(self, prefix, k=None):
+        """Return the cached results for the given prefix and k and mark them
+           as most recently used, or return None if they are not cached.
+
+           Runtime Complexity: O(1)
+
+        """
+        key = (prefix, k)
+        results = self.results.get(key)
+        if results is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.results.move_to_end(key)
+        return results
+
+    def put(self, prefix, k, results):
+        """Cache the given results for the given prefix and k, evicting the
+           least recently used results if this cache is full.
+
+           Runtime Complexity: O(1)
+
+        """
+        key = (prefix, k)
+        self.results[key] = results
+        self.results.move_to_end(key)
+        self.prefixes.setdefault(prefix, set()).add(k)
+        if len(self.results) > self.capacity:
+            (old_prefix, old_k), old_results = self.results.popitem(last=False)
+            self._unindex(old_prefix, old_k)
+            self.evictions += 1
+
+    def invalidate(self, string):
+        """Remove the cached results for every prefix of the given string
+           (including the empty prefix and the string itself), which are the
+           only prefixes whose completions change when it is inserted or
+           deleted.
+
+           Runtime Complexity:
+           O(m^2) for a string of length m, for slicing each of its m + 1
+           prefixes, plus O(1) for each result removed.
+
+        """
+        if len(self.prefixes) == 0:
+            return
+        for length in range(len(string) + 1):
+            prefix = string[:length]
+            for k in self.prefixes.pop(prefix, ()):
+                del self.results[(prefix, k)]
+                self.invalidations += 1
+
+    def clear(self):
+        """Remove all results from this cache, keeping its counters."""
+        self.results.clear()
+        self.prefixes.clear()
+
+    def _unindex(self, prefix, k):
+        """Remove the given k value from the index of the given prefix."""
+        ks = self.prefixes[prefix]
+        ks.discard(k)
+        if len(ks) == 0:
+            del self.prefixes[prefix]
+
+    def stats(self):
+        """Return a dictionary of the size, capacity and counters of this
+        cache, and the ratio of hits to lookups."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.results),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_ratio': self.hits / lookups if lookups > 0 else 0.0,
+        }
@@ -0,0 +1,57 @@
+#!python3
+
+from completioncache import CompletionCache
+import unittest
+
+
+class CompletionCacheTest(unittest.TestCase):
+
+    def test_get_and_put(self):
+        cache = CompletionCache(2)
+        assert cache.get('A') is None
+        cache.put('A', None, ('A', 'AB'))
+        cache.put('A', 1, ('A',))
+        assert len(cache) == 2
+        assert cache.get('A') == ('A', 'AB')
+        assert cache.get('A', 1) == ('A',)
+        assert cache.get('B') is None
+        stats = cache.stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 2
+        assert stats['hit_ratio'] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        cache = CompletionCache(2)
+        cache.put('A', None, ('A',))
+        cache.put('B', None, ('B',))
+        # Verify using 'A' makes 'B' the least recently used result
+        assert cache.get('A') == ('A',)
+        cache.put('C', None, ('C',))
+        assert cache.get('B') is None
+        assert cache.get('A') == ('A',)
+        assert cache.get('C') == ('C',)
+        assert cache.stats()['evictions'] == 1
+        assert len(cache) == 2
+
+    def test_invalidate_prefixes_of_string(self):
+        cache = CompletionCache(10)
+        for prefix in ['', 'A', 'AB', 'ABC', 'AC', 'B']:
+            cache.put(prefix, None, ())
+        cache.put('A', 3, ())
+        cache.invalidate('AB')
+        # Verify only the prefixes of 'AB' are invalidated
+        for prefix in ['', 'A', 'AB']:
+            assert cache.get(prefix) is None
+        assert cache.get('A', 3) is None
+        for prefix in ['ABC', 'AC', 'B']:
+            assert cache.get(prefix) == ()
+        assert cache.stats()['invalidations'] == 4
+        assert len(cache) == 3
+
+    def test_capacity_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            CompletionCache(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,249 @@
+#!python3
+
+import sys
+
+
+class DAWGNode:
+    """DAWGNode: A node in a directed acyclic word graph, which may be the
+       child of many nodes. Its outgoing edges map characters to child nodes,
+       and it is terminal if the path to it from the root spells a string."""
+
+    __slots__ = ('children', 'terminal')
+
+    def __init__(self):
+        """Initialize this node with no children and not terminal."""
+        self.children = {}
+        self.terminal = False
+
+    def signature(self):
+        """Return a hashable key that is equal for two nodes exactly when they
+        are terminal alike and have the same edges to the same child nodes,
+        which means they are the roots of identical subgraphs once their
+        children are minimized."""
+        return (self.terminal,
+                tuple((character, id(child))
+                      for character, child in self.children.items()))
+
+    def __repr__(self):
+        """Return a code representation of this node."""
+        return f'DAWGNode({"".join(self.children)!r})'
+
+
+class DAWG:
+    """DAWG: A minimal directed acyclic word graph, which stores the same
+       strings as a PrefixTree but shares common suffixes as well as common
+       prefixes, by merging every pair of nodes whose subgraphs are identical.
+
+       Strings must be inserted in sorted order, which lets the graph be
+       minimized incrementally (Daciuk et al., 2000): once a string diverges
+       from the previous one, the nodes that held the previous string's
+       unshared suffix can never change again, so each is either replaced by
+       an identical node already in the register of minimized nodes or added
+       to the register itself.
+
+    """
+
+    def __init__(self, strings=None):
+        """Initialize this graph and insert the given strings, if any, after
+        sorting them."""
+        self.root = DAWGNode()
+        # Count the number of strings inserted into the graph
+        self.size = 0
+        # Minimized nodes by their signatures
+        self._register = {}
+        # Edges (parent, character, child) along the path of the previous
+        # string whose child nodes are not minimized yet
+        self._unchecked = []
+        self._previous = None
+        # Marks if the graph is minimized and closed to more inserts
+        self.finished = False
+        if strings is not None:
+            for string in sorted(strings):
+                self.insert(string)
+            self.finish()
+
+    @classmethod
+    def from_sorted(cls, strings):
+        """Return a new minimal graph that stores the given strings, which
+        must be in sorted order, or raise ValueError if they are not."""
+        dawg = cls()
+        for string in strings:
+            dawg.insert(string)
+        dawg.finish()
+        return dawg
+
+    def __repr__(self):
+        """Return a string representation of this graph."""
+        return f'DAWG({self.strings()!r})'
+
+    def is_empty(self):
+        """Return True if this graph is empty (contains no strings)."""
+        return (self.size == 0)
+
+    def insert(self, string):
+        """Insert the given string, which must not sort before any string
+           already inserted, or raise ValueError if it does or if this graph
+           is finished. Repeated strings are ignored.
+
+           Runtime Complexity:
+           O(m), where m is the length of the string plus the length of the
+           unshared suffix of the previous string, which is minimized here.
+
+        """
+        if self.finished is True:
+            raise ValueError('Cannot insert into a finished DAWG')
+        if self._previous is not None and string <= self._previous:
+            if string == self._previous:
+                return
+            raise ValueError(f'String {string!r} is out of sorted order')
+        previous = self._previous or ''
+        common = 0
+        while (common < len(string) and common < len(previous) and
+               string[common] == previous[common]):
+            common += 1
+        # The previous string's nodes past the common prefix are final now
+        self._minimize(common)
+        if len(self._unchecked) == 0:
+            node = self.root
+        else:
+            node = self._unchecked[-1][2]
+        for character in string[common:]:
+            child = DAWGNode()
+            node.children[character] = child
+            self._unchecked.append((node, character, child))
+            node = child
+        node.terminal = True
+        self.size += 1
+        self._previous = string
+
+    def finish(self):
+        """Minimize the nodes along the path of the last inserted string, so
+        the whole graph is minimal, and close it to more inserts, since nodes
+        along the path of a new string may now be shared with other paths.
+        The register of minimized nodes is no longer needed, so it is freed.
+        """
+        self._minimize(0)
+        self._register = {}
+        self.finished = True
+
+    def _minimize(self, depth):
+        """Minimize the unchecked nodes deeper than the given depth, from the
+        deepest up, replacing each with an identical registered node if there
+        is one, or else registering it."""
+        while len(self._unchecked) > depth:
+            parent, character, child = self._unchecked.pop()
+            key = child.signature()
+            node = self._register.get(key)
+            if node is None:
+                self._register[key] = child
+            else:
+                parent.children[character] = node
+
+    def _find_node(self, string):
+        """Return the node reached by following the characters of the given
+        string from the root, or None if the path leaves the graph."""
+        node = self.root
+        for character in string:
+            node = node.children.get(character)
+            if node is None:
+                return None
+        return node
+
+    def contains(self, string):
+        """Return True if this graph contains the given string.
+
+           Runtime Complexity: O(m), where m is the length of the string.
+
+        """
+        node = self._find_node(string)
+        return node is not None and node.terminal
+
+    def complete(self, prefix):
+        """Return a list of all strings stored in this graph that start with
+        the given prefix string, in sorted order."""
+        return list(self.iter_complete(prefix))
+
+    def strings(self):
+        """Return a list of all strings stored in this graph, in sorted
+        order."""
+        return list(self.iter_complete(''))
+
+    def iter_complete(self, prefix):
+        """Generate all strings stored in this graph that start with the given
+           prefix string, lazily and in sorted order.
+
+           Runtime Complexity:
+           O(m + k), where m is the length of the prefix and k is the total
+           length of the completions, since shared nodes are visited once
+           for every string that passes through them.
+
+        """
+        node = self._find_node(prefix)
+        if node is None:
+            return
+        if node.terminal is True:
+            yield prefix
+        path = [prefix]
+        stack = [iter(node.children.items())]
+        while len(stack) > 0:
+            character, child = next(stack[-1], (None, None))
+            if child is None:
+                stack.pop()
+                path.pop()
+                continue
+            path.append(character)
+            if child.terminal is True:
+                yield ''.join(path)
+            stack.append(iter(child.children.items()))
+
+    def nodes(self):
+        """Return a list of the distinct nodes in this graph."""
+        seen = {id(self.root): self.root}
+        stack = [self.root]
+        while len(stack) > 0:
+            node = stack.pop()
+            for child in node.children.values():
+                if id(child) not in seen:
+                    seen[id(child)] = child
+                    stack.append(child)
+        return list(seen.values())
+
+    def num_nodes(self):
+        """Return the number of distinct nodes in this graph."""
+        return len(self.nodes())
+
+    def memory_size(self):
+        """Return the number of bytes used by the nodes of this graph and
+        their children dictionaries, not counting the register."""
+        return sum(sys.getsizeof(node) + sys.getsizeof(node.children)
+                   for node in self.nodes())
+
+
+def main():
+    """Compare the node count and memory use of a PrefixTree and a DAWG."""
+    from arrayprefixtree import node_memory_size
+    from autocomplete import get_lines
+    from prefixtree import PrefixTree
+    words = get_lines(sys.argv[1]) if len(sys.argv) > 1 else get_lines()
+
+    tree = PrefixTree(words)
+    tree_nodes = 0
+    stack = [tree.root]
+    while len(stack) > 0:
+        node = stack.pop()
+        tree_nodes += 1
+        stack.extend(node.children.values())
+    tree_bytes = node_memory_size(tree.root)
+    dawg = DAWG(words)
+    dawg_nodes = dawg.num_nodes()
+    dawg_bytes = dawg.memory_size()
+
+    print(f'Vocabulary size: {tree.size} words')
+    print(f'PrefixTree: {tree_nodes:9} nodes {tree_bytes:11} bytes')
+    print(f'DAWG:       {dawg_nodes:9} nodes {dawg_bytes:11} bytes')
+    print(f'Reduction:  {tree_nodes / dawg_nodes:9.1f}x     '
+          f'{tree_bytes / dawg_bytes:10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
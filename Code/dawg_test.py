@@ -0,0 +1,71 @@
+#!python3
+
+from dawg import DAWG
+from prefixtree import PrefixTree
+import unittest
+
+
+class DAWGTest(unittest.TestCase):
+
+    def test_init_and_properties(self):
+        dawg = DAWG()
+        assert dawg.size == 0
+        assert dawg.is_empty() is True
+        assert dawg.num_nodes() == 1
+        assert dawg.strings() == []
+
+    def test_shares_common_suffixes(self):
+        dawg = DAWG(['tap', 'taps', 'top', 'tops'])
+        # Verify 'a' and 'o' lead to the same node for the suffixes 'p', 'ps'
+        node_t = dawg.root.children['t']
+        assert node_t.children['a'] is node_t.children['o']
+        assert dawg.num_nodes() == 5
+        assert dawg.size == 4
+
+    def test_contains_and_complete(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ', 'WAFFLE TIME']
+        dawg = DAWG(strings)
+        for string in strings:
+            assert dawg.contains(string) is True
+        for string in ['AB', 'X', 'XYZW', 'B', '']:
+            assert dawg.contains(string) is False
+        assert dawg.complete('A') == ['A', 'ABC', 'ABD']
+        assert dawg.complete('AB') == ['ABC', 'ABD']
+        assert dawg.complete('AX') == []
+        assert dawg.strings() == sorted(strings)
+
+    def test_same_results_as_prefix_tree_with_fewer_nodes(self):
+        stems = ['walk', 'talk', 'jump', 'play', 'work', 'park']
+        suffixes = ['', 's', 'ed', 'ing', 'er', 'ers']
+        strings = [stem + suffix for stem in stems for suffix in suffixes]
+        dawg = DAWG(strings)
+        tree = PrefixTree(strings)
+        for prefix in ['', 'w', 'wa', 'walk', 'walke', 'p', 'x']:
+            assert dawg.complete(prefix) == sorted(tree.complete(prefix))
+        # The nodes of the suffixes are shared by all 6 stems
+        assert dawg.num_nodes() == 18
+        assert dawg.num_nodes() < len(''.join(strings)) // 10
+
+    def test_from_sorted_and_insert_order(self):
+        dawg = DAWG()
+        dawg.insert('A')
+        dawg.insert('A')
+        dawg.insert('AB')
+        dawg.insert('B')
+        # Verify queries work before the graph is finished
+        assert dawg.strings() == ['A', 'AB', 'B']
+        with self.assertRaises(ValueError):
+            dawg.insert('AA')
+        dawg.finish()
+        assert dawg.size == 3
+        assert dawg.strings() == ['A', 'AB', 'B']
+        # Verify the leaf nodes of 'AB' and 'B' are shared
+        assert dawg.root.children['B'] is dawg.root.children['A'].children['B']
+        with self.assertRaises(ValueError):
+            dawg.insert('BC')
+        with self.assertRaises(ValueError):
+            DAWG.from_sorted(['B', 'A'])
+
+
+if __name__ == '__main__':
+    unittest.main()
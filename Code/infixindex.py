@@ -0,0 +1,186 @@
+#!python3
+
+from array import array
+from sortedvocabulary import _prefix_successor
+import sys
+
+
+class InfixIndex:
+    """InfixIndex: A read-only index of a set of strings that finds every
+       string containing a given fragment anywhere, not only at its start.
+
+       The strings are kept in sorted order in one contiguous text, each
+       followed by a separator character, with an array of the offsets at
+       which each string starts (as in SortedVocabulary). A suffix array holds
+       the offset of every character of every string, sorted by the rest of
+       its string from that offset. All suffixes that start with a fragment
+       are a contiguous run of the suffix array, found with two binary
+       searches, and a parallel array holds the index of the string each
+       suffix is in.
+
+    """
+
+    # Character that ends each string in the text, which sorts before every
+    # other character, so a suffix that ends sorts before its extensions
+    SEPARATOR = '\x00'
+
+    def __init__(self, strings=None):
+        """Initialize this index with the given strings, if any, sorted and
+           without repeats, or raise ValueError if a string contains the
+           separator character.
+
+           Runtime Complexity:
+           O(c * log(c) * m) for c characters in strings of length at most m,
+           to sort the suffixes. Suffixes are sorted in groups by their first
+           character, so only one group of suffix strings is held at a time.
+
+        """
+        words = sorted(set(strings)) if strings is not None else []
+        for word in words:
+            if InfixIndex.SEPARATOR in word:
+                raise ValueError(f'String {word!r} contains the separator')
+        # All strings joined in sorted order, each followed by a separator
+        self.text = ''.join(word + InfixIndex.SEPARATOR for word in words)
+        # Offset of the start of each string
+        self.offsets = array('L')
+        # Offsets of the suffixes of every string, sorted by suffix, and the
+        # index of the string that each one is in, with one entry of four
+        # bytes per character (enough for texts of up to 2**32 characters)
+        self.suffixes = array('I')
+        self.owners = array('I')
+        # Index of the string at each offset of the text, while building
+        owners = array('I')
+        groups = {}
+        offset = 0
+        for index, word in enumerate(words):
+            self.offsets.append(offset)
+            owners.extend([index] * (len(word) + 1))
+            for position in range(offset, offset + len(word)):
+                groups.setdefault(self.text[position], []).append(position)
+            offset += len(word) + 1
+        for character in sorted(groups):
+            group = groups.pop(character)
+            group.sort(key=self._suffix)
+            self.suffixes.extend(group)
+            self.owners.extend(owners[position] for position in group)
+        # Count the number of strings in the index
+        self.size = len(words)
+
+    def __repr__(self):
+        """Return a string representation of this index."""
+        return f'InfixIndex({self.strings()!r})'
+
+    def is_empty(self):
+        """Return True if this index is empty (contains no strings)."""
+        return (self.size == 0)
+
+    def _suffix(self, offset):
+        """Return the rest of the string at the given offset of the text."""
+        return self.text[offset:self.text.index(InfixIndex.SEPARATOR, offset)]
+
+    def _word(self, index):
+        """Return the string at the given index in sorted order."""
+        start = self.offsets[index]
+        return self.text[start:self.text.index(InfixIndex.SEPARATOR, start)]
+
+    def _lower_bound(self, fragment, low=0):
+        """Return the index of the first suffix in sorted order whose first
+           characters are not less than the given fragment, searching from the
+           given index.
+
+           Runtime Complexity:
+           O(m * log(c)) for a fragment of length m and c suffixes.
+
+        """
+        high = len(self.suffixes)
+        length = len(fragment)
+        while low < high:
+            middle = (low + high) // 2
+            offset = self.suffixes[middle]
+            if self.text[offset:offset + length] < fragment:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _range(self, fragment):
+        """Return a pair of the index of the first suffix that starts with the
+        given fragment and the index just past the last one."""
+        low = self._lower_bound(fragment)
+        successor = _prefix_successor(fragment)
+        if successor is None:
+            return low, len(self.suffixes)
+        return low, self._lower_bound(successor, low)
+
+    def count(self, fragment):
+        """Return the number of occurrences of the given nonempty fragment in
+        the strings of this index, in O(m * log(c)) time."""
+        low, high = self._range(fragment)
+        return high - low
+
+    def find_containing(self, fragment):
+        """Return a list of all strings in this index that contain the given
+           fragment, in sorted order.
+
+           Runtime Complexity:
+           O(m * log(c) + z + k * log(k)), where m is the length of the
+           fragment, c is the number of characters of all strings, z is the
+           number of occurrences of the fragment and k is the number of
+           strings that contain it, which are sorted by index.
+
+        """
+        if len(fragment) == 0:
+            return self.strings()
+        if InfixIndex.SEPARATOR in fragment:
+            return []
+        low, high = self._range(fragment)
+        indexes = sorted(set(self.owners[low:high]))
+        return [self._word(index) for index in indexes]
+
+    def strings(self):
+        """Return a list of all strings in this index, in sorted order."""
+        return [self._word(index) for index in range(self.size)]
+
+    def memory_size(self):
+        """Return the number of bytes used by this index's text, array of
+        string offsets and arrays of suffix offsets and owners."""
+        return (sys.getsizeof(self.text) + sys.getsizeof(self.offsets) +
+                sys.getsizeof(self.suffixes) + sys.getsizeof(self.owners))
+
+
+def main():
+    """Compare the time to find the words in the given file that contain each
+    of the given fragments with an index and with a linear scan, and report
+    the memory the index uses."""
+    import time
+    from autocomplete import get_lines
+    if len(sys.argv) < 3:
+        print(f'Usage: {sys.argv[0]} vocabulary-file fragment [fragment ...]')
+        return
+    words = get_lines(sys.argv[1])
+
+    start_time = time.time()
+    index = InfixIndex(words)
+    build_time = time.time()
+    words = index.strings()
+    words_bytes = sys.getsizeof(words) + sum(map(sys.getsizeof, words))
+    print(f'Vocabulary size: {index.size} words, {len(index.suffixes)} '
+          f'suffixes')
+    print(f'Build time: {build_time - start_time:.6f} sec')
+    print(f'InfixIndex:      {index.memory_size() / index.size:8.1f} bytes '
+          f'per word')
+    print(f'List of strings: {words_bytes / index.size:8.1f} bytes per word')
+    for fragment in sys.argv[2:]:
+        start_time = time.time()
+        found = index.find_containing(fragment)
+        index_time = time.time()
+        scanned = [word for word in words if fragment in word]
+        scan_time = time.time()
+        assert found == scanned
+        print(f'{fragment!r}: {len(found)} words, index '
+              f'{index_time - start_time:.6f} sec, linear scan '
+              f'{scan_time - index_time:.6f} sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!python3
+
+from infixindex import InfixIndex
+from prefixtree import PrefixTree
+import unittest
+
+
+class InfixIndexTest(unittest.TestCase):
+
+    def test_init_and_strings(self):
+        index = InfixIndex(['banana', 'band', 'abandon', 'band', ''])
+        assert index.size == 4
+        assert index.is_empty() is False
+        assert index.strings() == ['', 'abandon', 'banana', 'band']
+        assert InfixIndex().is_empty() is True
+        assert InfixIndex().find_containing('a') == []
+
+    def test_suffixes_are_sorted(self):
+        index = InfixIndex(['banana', 'band', 'an'])
+        suffixes = [index._suffix(offset) for offset in index.suffixes]
+        assert suffixes == sorted(suffixes)
+        assert len(suffixes) == len('banana') + len('band') + len('an')
+
+    def test_find_containing(self):
+        strings = ['banana', 'band', 'abandon', 'cab', 'an', 'nab', 'xyz']
+        index = InfixIndex(strings)
+        assert index.find_containing('an') == ['abandon', 'an', 'banana',
+                                               'band']
+        assert index.find_containing('ab') == ['abandon', 'cab', 'nab']
+        assert index.find_containing('nab') == ['nab']
+        assert index.find_containing('banana') == ['banana']
+        assert index.find_containing('bananas') == []
+        # A fragment does not match across the end of one string
+        assert index.find_containing('ndc') == []
+        assert index.find_containing('q') == []
+        assert index.find_containing('') == sorted(strings)
+        assert index.count('an') == 2 + 1 + 1 + 1
+        assert index.count('q') == 0
+
+    def test_built_from_prefix_tree(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ', 'BCD'])
+        index = InfixIndex(tree.strings())
+        assert index.find_containing('BC') == ['ABC', 'BCD']
+        assert index.memory_size() > 0
+
+    def test_separator_is_rejected(self):
+        with self.assertRaises(ValueError):
+            InfixIndex(['a\x00b'])
+        assert InfixIndex(['ab']).find_containing('a\x00') == []
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,363 @@
+#!python3
+
+import bisect
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+# File format of a saved prefix tree (all integers are little-endian):
+#   header: magic bytes, number of strings, number of nodes, root offset
+#   node:   flags (TERMINAL, WEIGHTED), label length in bytes, number of
+#           children, weight (if TERMINAL), maximum weight in the subtree (if
+#           WEIGHTED), UTF-8 label bytes, then one (first code point of the
+#           child's label, child offset) entry per child in code point order
+# Nodes are written in post-order, so every child is written before its
+# parent and the root is written last. Offsets and counts of strings and
+# nodes take eight bytes and label lengths four, so any tree that fits in
+# memory can be saved.
+MAGIC = b'PTRIE\x00\x02\x00'
+HEADER = struct.Struct('<8sQQQ')
+NODE = struct.Struct('<BII')
+WEIGHT = struct.Struct('<d')
+EDGE = struct.Struct('<IQ')
+TERMINAL = 1
+WEIGHTED = 2
+
+
+def save_prefix_tree(tree, filename):
+    """Write the given PrefixTree (or RadixTree) to the given file in the
+       binary format read by MappedPrefixTree. The tree is written to a
+       temporary file beside it that replaces the file only once it is
+       complete, so a save that fails leaves no file that can be loaded.
+
+       Runtime Complexity:
+       O(n), where n is the number of nodes in the tree, whose children are
+       already in sorted order.
+
+    """
+    temporary = filename + '.tmp'
+    try:
+        with open(temporary, 'wb') as file:
+            # Leave out the magic bytes until every node is written
+            file.write(HEADER.pack(bytes(len(MAGIC)), 0, 0, 0))
+            offset = HEADER.size
+            num_nodes = 0
+            # Each stack entry is a node and the edges to its written children
+            stack = [(tree.root, iter(tree.root.children.items()), [])]
+            while len(stack) > 0:
+                node, children, edges = stack[-1]
+                character, child = next(children, (None, None))
+                if child is not None:
+                    stack.append((child, iter(child.children.items()), []))
+                    continue
+                # All children are written, so write this node after them
+                stack.pop()
+                record = _pack_node(node, edges)
+                if len(stack) > 0:
+                    stack[-1][2].append((ord(node.character[0]), offset))
+                file.write(record)
+                root_offset = offset
+                offset += len(record)
+                num_nodes += 1
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, tree.size, num_nodes, root_offset))
+        os.replace(temporary, filename)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _pack_node(node, edges):
+    """Return the bytes of the record of the given node with the given list
+    of (code point, offset) pairs of its children."""
+    label = node.character.encode('utf-8')
+    flags = 0
+    parts = []
+    if node.is_terminal() is True:
+        flags |= TERMINAL
+        parts.append(WEIGHT.pack(node.weight or 0))
+    if node.max_weight is not None:
+        flags |= WEIGHTED
+        parts.append(WEIGHT.pack(node.max_weight))
+    parts.append(label)
+    for code, offset in edges:
+        parts.append(EDGE.pack(code, offset))
+    return NODE.pack(flags, len(label), len(edges)) + b''.join(parts)
+
+
+class MappedPrefixTree:
+    """MappedPrefixTree: A read-only prefix tree that answers queries directly
+       from a file written by PrefixTree.save, which is memory-mapped rather
+       than read, so loading takes the same short time for any number of
+       strings and only the pages of nodes that are visited are read in.
+
+       Nodes are byte offsets into the mapped file, and children are found by
+       binary search on their sorted first code points, so strings are
+       retrieved in lexicographic order.
+
+    """
+
+    def __init__(self, filename):
+        """Map the prefix tree saved in the given file, or raise ValueError if
+        the file is not a saved prefix tree."""
+        with open(filename, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < HEADER.size:
+            self.data.close()
+            raise ValueError(f'{filename!r} is not a saved prefix tree')
+        magic, size, num_nodes, root = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            self.data.close()
+            raise ValueError(f'{filename!r} is not a saved prefix tree')
+        # Count the number of strings stored in the tree
+        self.size = size
+        self.num_nodes = num_nodes
+        # Offset of the root node
+        self.root = root
+
+    @classmethod
+    def from_strings(cls, strings):
+        """Return a mapped prefix tree of the given strings, saved to a
+        temporary file that is removed as soon as it is mapped."""
+        from prefixtree import PrefixTree
+        descriptor, filename = tempfile.mkstemp(suffix='.trie')
+        os.close(descriptor)
+        try:
+            PrefixTree(strings).save(filename)
+            return cls(filename)
+        finally:
+            os.remove(filename)
+
+    def __repr__(self):
+        """Return a string representation of this prefix tree."""
+        return f'MappedPrefixTree({self.strings()!r})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        """Unmap the file of this prefix tree."""
+        self.data.close()
+
+    def is_empty(self):
+        """Return True if this prefix tree is empty (contains no strings)."""
+        return (self.size == 0)
+
+    def _read_node(self, offset):
+        """Return a tuple of the terminal flag, weight, maximum weight, label,
+        offset of the first child entry and number of children of the node at
+        the given offset."""
+        flags, label_length, num_children = NODE.unpack_from(self.data, offset)
+        offset += NODE.size
+        weight = max_weight = None
+        if flags & TERMINAL:
+            weight = WEIGHT.unpack_from(self.data, offset)[0]
+            offset += WEIGHT.size
+        if flags & WEIGHTED:
+            max_weight = WEIGHT.unpack_from(self.data, offset)[0]
+            offset += WEIGHT.size
+        label = self.data[offset:offset + label_length].decode('utf-8')
+        offset += label_length
+        return (flags & TERMINAL == TERMINAL, weight, max_weight, label,
+                offset, num_children)
+
+    def _get_child(self, edges, num_children, character):
+        """Return the offset of the child whose label starts with the given
+           character among the given number of child entries starting at the
+           given offset, or None if there is no such child.
+
+           Runtime Complexity: O(log(b)) for a node with b children.
+
+        """
+        code = ord(character)
+        low, high = 0, num_children - 1
+        while low <= high:
+            middle = (low + high) // 2
+            child_code, child = EDGE.unpack_from(self.data,
+                                                 edges + middle * EDGE.size)
+            if child_code == code:
+                return child
+            elif child_code < code:
+                low = middle + 1
+            else:
+                high = middle - 1
+        return None
+
+    def _find_completion_node(self, prefix):
+        """Return a pair containing the offset of the node below which all
+           strings that start with the given prefix are stored and the string
+           on the path to that node, or (None, None) if there is none.
+
+           Runtime Complexity: O(m * log(b)) for a prefix of length m.
+
+        """
+        node, index = self.root, 0
+        while index < len(prefix):
+            terminal, weight, max_weight, label, edges, num_children = \
+                self._read_node(node)
+            child = self._get_child(edges, num_children, prefix[index])
+            if child is None:
+                return None, None
+            label = self._read_node(child)[3]
+            if prefix.startswith(label, index) is True:
+                index += len(label)
+            elif label.startswith(prefix[index:]) is True:
+                # The prefix ends partway along the label of the child
+                return child, prefix[:index] + label
+            else:
+                return None, None
+            node = child
+        return node, prefix
+
+    def contains(self, string):
+        """Return True if this prefix tree contains the given string.
+
+           Runtime Complexity: O(m * log(b)) for a string of length m.
+
+        """
+        node, path = self._find_completion_node(string)
+        return node is not None and path == string and self._read_node(node)[0]
+
+    def complete(self, prefix, k=None):
+        """Return a list of all strings stored in this prefix tree that start
+        with the given prefix string, in lexicographic order, or only the k
+        with the highest weights, from highest to lowest, if k is given."""
+        if k is None:
+            return list(self.iter_complete(prefix))
+        completions = []
+        node, path = self._find_completion_node(prefix)
+        if node is not None:
+            self._traverse_best(node, path, k, completions.append)
+        return completions
+
+    def complete_many(self, prefixes):
+        """Return a dictionary that maps each of the given prefix strings to
+           the list of strings stored in this prefix tree that start with it.
+
+           Runtime Complexity:
+           The prefixes are sorted, and only those that do not start with an
+           earlier prefix are completed from the file. Completions come out in
+           lexicographic order, so the completions of each nested prefix are
+           the contiguous run of its outer prefix's completions found with a
+           binary search, in O(log(k) + j) time for j of k completions.
+
+        """
+        completions = {}
+        outer, results = None, []
+        for prefix in sorted(set(prefixes)):
+            if outer is not None and prefix.startswith(outer):
+                start = end = bisect.bisect_left(results, prefix)
+                while end < len(results) and results[end].startswith(prefix):
+                    end += 1
+                completions[prefix] = results[start:end]
+            else:
+                outer, results = prefix, self.complete(prefix)
+                completions[prefix] = results
+        return completions
+
+    def strings(self):
+        """Return a list of all strings stored in this prefix tree, in
+        lexicographic order."""
+        return list(self.iter_complete(''))
+
+    def iter_complete(self, prefix):
+        """Generate all strings stored in this prefix tree that start with the
+           given prefix string, lazily and in lexicographic order.
+
+           Runtime Complexity:
+           O(m * log(b) + k), where m is the length of the prefix and k is the
+           number of nodes in the subtree below it.
+
+        """
+        node, path = self._find_completion_node(prefix)
+        if node is None:
+            return
+        terminal, weight, max_weight, label, edges, num_children = \
+            self._read_node(node)
+        if terminal is True:
+            yield path
+        labels = [path]
+        # Each stack entry is the offset of the next child entry of a node
+        # on the current path and the offset just past its last child entry
+        stack = [(edges, edges + num_children * EDGE.size)]
+        while len(stack) > 0:
+            edge, end = stack[-1]
+            if edge == end:
+                stack.pop()
+                labels.pop()
+                continue
+            stack[-1] = (edge + EDGE.size, end)
+            child = EDGE.unpack_from(self.data, edge)[1]
+            terminal, weight, max_weight, label, edges, num_children = \
+                self._read_node(child)
+            labels.append(label)
+            if terminal is True:
+                yield ''.join(labels)
+            stack.append((edges, edges + num_children * EDGE.size))
+
+    def _traverse_best(self, node, prefix, k, visit):
+        """Visit the k strings with the highest weights stored below the node
+        at the given offset, whose path is the given prefix, from the highest
+        weight to the lowest with a best-first search (see PrefixTree)."""
+        max_weight = self._read_node(node)[2]
+        if k <= 0 or max_weight is None:
+            return
+        heap = [(-max_weight, prefix, 1, node)]
+        while len(heap) > 0:
+            weight, string, is_subtree, node = heapq.heappop(heap)
+            if is_subtree == 0:
+                visit(string)
+                k -= 1
+                if k == 0:
+                    return
+                continue
+            terminal, weight, max_weight, label, edges, num_children = \
+                self._read_node(node)
+            if terminal is True:
+                heapq.heappush(heap, (-weight, string, 0, None))
+            for index in range(num_children):
+                edge = edges + index * EDGE.size
+                child = EDGE.unpack_from(self.data, edge)[1]
+                child_max_weight, child_label = self._read_node(child)[2:4]
+                if child_max_weight is not None:
+                    heapq.heappush(heap, (-child_max_weight,
+                                          string + child_label, 1, child))
+
+
+def main():
+    """Save a prefix tree of the words in the given file to the given file,
+    then compare the time to build the tree with the time to map it."""
+    import time
+    from autocomplete import get_lines
+    from prefixtree import PrefixTree
+    if len(sys.argv) != 3:
+        print(f'Usage: {sys.argv[0]} vocabulary-file prefix-tree-file')
+        return
+    words = get_lines(sys.argv[1])
+
+    start_time = time.time()
+    tree = PrefixTree(words)
+    build_time = time.time()
+    tree.save(sys.argv[2])
+    save_time = time.time()
+    mapped_tree = PrefixTree.load(sys.argv[2])
+    load_time = time.time()
+
+    print(f'Vocabulary size: {mapped_tree.size} words, '
+          f'{mapped_tree.num_nodes} nodes, '
+          f'{os.path.getsize(sys.argv[2])} bytes')
+    print(f'Build time: {build_time - start_time:.6f} sec')
+    print(f'Save time:  {save_time - build_time:.6f} sec')
+    print(f'Load time:  {load_time - save_time:.6f} sec')
+    mapped_tree.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!python3
+
+from mappedprefixtree import MappedPrefixTree
+from prefixtree import PrefixTree, RadixTree
+import os
+import tempfile
+import unittest
+
+
+class MappedPrefixTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.filename = os.path.join(directory, 'strings.trie')
+
+    def tearDown(self):
+        os.remove(self.filename)
+        os.rmdir(os.path.dirname(self.filename))
+
+    def test_save_and_load(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ', 'WAFFLE TIME', 'café', '']
+        tree = PrefixTree(strings)
+        tree.save(self.filename)
+        with PrefixTree.load(self.filename) as mapped_tree:
+            assert isinstance(mapped_tree, MappedPrefixTree)
+            assert mapped_tree.size == len(strings)
+            assert mapped_tree.is_empty() is False
+            for string in strings:
+                assert mapped_tree.contains(string) is True
+            for string in ['AB', 'X', 'XYZW', 'caf', 'B']:
+                assert mapped_tree.contains(string) is False
+            assert mapped_tree.strings() == sorted(strings)
+            assert mapped_tree.complete('A') == ['A', 'ABC', 'ABD']
+            assert mapped_tree.complete('ca') == ['café']
+            assert mapped_tree.complete('AX') == []
+            assert list(mapped_tree.iter_complete('XY')) == ['XYZ']
+
+    def test_complete_many(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ', 'XY'])
+        tree.save(self.filename)
+        prefixes = ['AB', 'A', 'X', 'XYZ', 'B', 'ABE', '']
+        with PrefixTree.load(self.filename) as mapped_tree:
+            completions = mapped_tree.complete_many(prefixes)
+            for prefix in prefixes:
+                assert completions[prefix] == mapped_tree.complete(prefix)
+
+    def test_complete_top_k_by_weight(self):
+        tree = PrefixTree()
+        weights = {'car': 5, 'cat': 9, 'cart': 7, 'care': 7, 'dog': 10}
+        for string, weight in weights.items():
+            tree.insert(string, weight)
+        tree.save(self.filename)
+        with PrefixTree.load(self.filename) as mapped_tree:
+            for prefix in ['', 'c', 'car', 'd', 'x']:
+                for k in [1, 3, 10]:
+                    assert (mapped_tree.complete(prefix, k) ==
+                            tree.complete(prefix, k))
+
+    def test_save_and_load_radix_tree(self):
+        strings = ['romane', 'romanus', 'romulus', 'rubens', 'ruber']
+        RadixTree(strings).save(self.filename)
+        with PrefixTree.load(self.filename) as mapped_tree:
+            assert mapped_tree.num_nodes == 10
+            assert mapped_tree.strings() == strings
+            assert mapped_tree.contains('romanus') is True
+            assert mapped_tree.contains('roman') is False
+            assert mapped_tree.complete('roma') == ['romane', 'romanus']
+            assert mapped_tree.complete('rube') == ['rubens', 'ruber']
+            assert mapped_tree.complete('rx') == []
+
+    def test_save_long_labels(self):
+        # Verify labels longer than 65535 bytes fit in a node record
+        strings = ['x' * 70000, 'x' * 70000 + 'y', 'y']
+        RadixTree(strings).save(self.filename)
+        with PrefixTree.load(self.filename) as mapped_tree:
+            assert mapped_tree.strings() == strings
+            assert mapped_tree.complete('xx') == strings[:2]
+
+    def test_failed_save_leaves_no_loadable_file(self):
+        PrefixTree(['ABC', 'ABD']).save(self.filename)
+        # A lone surrogate cannot be encoded, so the save fails partway
+        with self.assertRaises(UnicodeEncodeError):
+            PrefixTree(['A', '\ud800']).save(self.filename)
+        assert os.listdir(os.path.dirname(self.filename)) == ['strings.trie']
+        with PrefixTree.load(self.filename) as mapped_tree:
+            assert mapped_tree.strings() == ['ABC', 'ABD']
+
+    def test_load_empty_and_invalid_files(self):
+        PrefixTree().save(self.filename)
+        with PrefixTree.load(self.filename) as mapped_tree:
+            assert mapped_tree.is_empty() is True
+            assert mapped_tree.strings() == []
+            assert mapped_tree.contains('') is False
+        with open(self.filename, 'wb') as file:
+            file.write(b'not a prefix tree file')
+        with self.assertRaises(ValueError):
+            PrefixTree.load(self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,18 @@
 #!python3
 
 from prefixtreenode import PrefixTreeNode
+from completioncache import CompletionCache
+from mappedprefixtree import MappedPrefixTree, save_prefix_tree
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import base64
+import contextlib
+import gc
+import heapq
+import itertools
+import json
+import os
+import sys
 
 
 class PrefixTree:
@@ -18,23 +30,126 @@ class PrefixTree:
        This makes a prefix tree effective for spell-checking and
        autocompletion. Each string is stored as a sequence of characters along
        a path from the tree's root node to a terminal node that marks the end
-       of the string.
+       of the string. Children are kept in sorted order, so strings are
+       retrieved in lexicographic order, and ranges of strings between two
+       strings can be found by walking only the paths of their ends.
 
     """
 
     # Constant for the start character stored in the prefix tree's root node
     START_CHARACTER = ''
 
-    def __init__(self, strings=None):
-        """Initialize this prefix tree and insert the given strings, if any."""
+    def __init__(self, strings=None, cache_size=None):
+        """Initialize this prefix tree and insert the given strings, if any.
+        If a cache size is given, cache up to that many completion results,
+        evicting the least recently used."""
         # Create a new root node with the start character
         self.root = PrefixTreeNode(PrefixTree.START_CHARACTER)
         # Count the number of strings inserted into the tree
         self.size = 0
-        # Insert each string, if any were given
+        # Cache of completion results, if any
+        self.cache = None
+        if cache_size is not None:
+            self.cache = CompletionCache(cache_size)
+        # Insert each string in sorted order, if any were given
         if strings is not None:
-            for string in strings:
-                self.insert(string)
+            self._insert_sorted(sorted(strings))
+
+    @classmethod
+    def from_sorted(cls, strings):
+        """Return a new prefix tree that stores the given strings, which must
+           be in sorted order (duplicates are allowed), or raise ValueError if
+           they are not.
+
+           Runtime Complexity:
+           O(n * m), where n is the number of strings and m is their average
+           length, but each string is only walked from where it diverges from
+           the string before it, so shared prefixes are never walked again
+           from the root.
+
+        """
+        tree = cls()
+        tree._insert_sorted(strings)
+        return tree
+
+    @classmethod
+    def from_parallel(cls, strings, processes=None, prefix_length=1):
+        """Return a new prefix tree that stores the given strings, built by
+           the given number of worker processes (by default, one per CPU).
+
+           The strings are partitioned into shards by their first characters
+           (up to the given prefix length), which share no nodes past those
+           characters. Each worker builds the subtree of the rest of the
+           strings of a shard and returns it in a flat form of a list of
+           labels and a few arrays rather than as pickled nodes. This process
+           creates the nodes along the paths of the shared first characters,
+           then creates the nodes of each subtree from its flat form in one
+           pass, without walking or comparing any strings, and adopts it
+           below the node of its characters.
+
+           Runtime Complexity:
+           O(n * m / p + t) for n strings of average length m, p workers and
+           t nodes, since sorting the strings and finding where they diverge
+           is divided among the workers, but every node is still created in
+           this process. Creating them from the flat forms takes about two
+           fifths of the time from_sorted takes for a PrefixTree (less for a
+           RadixTree, which has fewer nodes), which bounds the speedup.
+
+        """
+        shards = {}
+        for string in strings:
+            shards.setdefault(string[:prefix_length], []).append(
+                string[prefix_length:])
+        keys = sorted(shards)
+        processes = processes or os.cpu_count() or 1
+        if processes == 1 or len(keys) <= 1:
+            # Building in one process is faster than building a flat form
+            return cls.from_sorted(sorted(key + rest for key in keys
+                                          for rest in shards[key]))
+        tree = cls()
+        # Nodes created along the paths of the shards' first characters
+        created = [tree.root]
+        # Send several small shards to a worker at a time
+        chunksize = max(1, len(keys) // (4 * processes))
+        with _paused_gc():
+            with ProcessPoolExecutor(processes) as executor:
+                flat_shards = executor.map(_build_shard, itertools.repeat(cls),
+                                           [shards.pop(key) for key in keys],
+                                           chunksize=chunksize)
+                for key, flat_shard in zip(keys, flat_shards):
+                    tree._adopt_shard(key, flat_shard, created)
+            tree._finish_adoption(created)
+        return tree
+
+    def _adopt_shard(self, key, flat_shard, created):
+        """Adopt the subtree of the given flat shard (see _build_shard), which
+        stores the rest of the strings that start with the given key, below
+        the node of the key,
+        creating the nodes along the key's path that do not exist yet and
+        appending them to the given list of created nodes."""
+        node = self.root
+        for character in key:
+            child = node.children.get(character)
+            if child is None:
+                child = PrefixTreeNode(character)
+                node.add_child(character, child)
+                created.append(child)
+            node = child
+        terminals = flat_shard[-1]
+        if terminals[0] == 1:
+            node.terminal = True
+        for character, child in _create_shard_children(*flat_shard).items():
+            node.add_child(character, child)
+
+    def _finish_adoption(self, created):
+        """Set the counts and weights of the given nodes created by
+        _adopt_shard, from the deepest ones up, and the size of this tree."""
+        for node in reversed(created):
+            node.count = int(node.terminal) + sum(
+                child.count for child in node.children.values())
+            node.weight = 0 if node.terminal is True else None
+            node.max_weight = 0 if node.count > 0 else None
+        self.size = self.root.count
 
     def __repr__(self):
         """Return a string representation of this prefix tree."""
@@ -62,44 +177,208 @@ class PrefixTree:
         node, length = self._find_node(string)
         return length == len(string) and node.is_terminal()
 
-    def insert(self, string):
-        """Insert the given string into this prefix tree.
-           Runtime Complexity:
-           O((nm) + (np)), where n is the size of the trie, m is the length of
-           string being searched as we look for a duplicate, and p is the
-           length of the string being nserted. This runtime depends on calling
-           the contains() method.
-           In the average case it will then also insert the new string, an
-           operation which the runtime depends on thethe size of the trie
-           (i.e. the number of strings already being stored) because will
-           increase the time we spend looking amongst the children of the root
-           node. Also, this second step depends on the length of the new string
-           being added.
-
-        """
-        # make sure the string not already in the tree
-        if self.contains(string) is False:
-            # find the node to start adding new letters from
-            current_node, index = self._find_node(string)
-            # for each index position in the string greater than index
-            for i in range(index, len(string)):
-                # returned, add a new child node of the node returned
-                next_char = string[i]
-                new_node = PrefixTreeNode(next_char)
-                current_node.add_child(next_char, new_node)
-                # then move the current node to its child
-                current_node = new_node
-            # mark the last node to be added as terminal
-            current_node.terminal = True
-            # increment size of the tree
+    def insert(self, string, weight=None):
+        """Insert the given string into this prefix tree with the given
+           weight, which ranks it among the top completions of its prefixes.
+           Inserting a string that is already stored replaces its weight, if
+           one is given, or keeps it; a new string without one gets weight 0.
+
+           Runtime Complexity:
+           O(m * b), where m is the length of the string being inserted and b
+           is the largest number of children of a node along its path. The
+           path is walked once to find or create its nodes, and walked back up
+           to update the cached maximum weights of the subtrees it passes
+           through, stopping early where a maximum does not change.
+
+        """
+        # Walk down the path of the string, adding nodes where it diverges
+        node = self.root
+        path = [node]
+        for character in string:
+            if node.has_child(character) is False:
+                node.add_child(character, PrefixTreeNode(character))
+            node = node.get_child(character)
+            path.append(node)
+        # mark the last node as terminal, if it is not already
+        if node.is_terminal() is False:
+            node.terminal = True
             self.size += 1
+            self._update_counts(path, 1)
+            node.weight = 0 if weight is None else weight
+        elif weight is not None:
+            node.weight = weight
+        else:
+            # the string is already stored and keeps its weight
+            return
+        self._update_weights(path)
+        self._invalidate(string)
+
+    def extend(self, strings):
+        """Insert each of the given strings, which may be any iterable (such
+           as the lines of a large file) and are consumed one at a time, so no
+           more than one is held in memory besides the tree.
+
+           Runtime Complexity:
+           O(n * m * b) for n strings of average length m, inserted one at a
+           time. But if this tree is empty, strings that arrive in sorted
+           order are grafted as by from_sorted, in O(n * m) time, until the
+           first string that is out of order.
+
+        """
+        strings = iter(strings)
+        if self.size == 0:
+            unsorted = []
+
+            def ascending():
+                """Generate the pairs of strings and common prefix lengths
+                to graft, until a string is out of sorted order."""
+                previous = None
+                for string in strings:
+                    if previous is not None and string <= previous:
+                        if string < previous:
+                            unsorted.append(string)
+                            return
+                        continue
+                    yield string, _common_prefix_length(previous or '',
+                                                        string, 0)
+                    previous = string
+
+            self._graft_sorted(ascending())
+            if self.cache is not None:
+                self.cache.clear()
+            for string in unsorted:
+                self.insert(string)
+        for string in strings:
+            self.insert(string)
+
+    def _invalidate(self, string):
+        """Remove any cached completions of prefixes of the given string,
+        which has just been inserted or deleted."""
+        if self.cache is not None:
+            self.cache.invalidate(string)
+
+    def _update_weights(self, path):
+        """Recompute the cached maximum weight of each node on the given path
+           of nodes from the root, starting from the deepest node. Only nodes
+           on the path can have changed, so once a node's maximum is unchanged
+           the maximums of the nodes above it are unchanged too.
+
+           Runtime Complexity:
+           O(m * b), where m is the length of the path and b is the largest
+           number of children of a node along it.
+
+        """
+        for node in reversed(path):
+            max_weight = node.weight if node.is_terminal() else None
+            for child in node.children.values():
+                if child.max_weight is not None and (
+                        max_weight is None or child.max_weight > max_weight):
+                    max_weight = child.max_weight
+            if max_weight == node.max_weight:
+                break
+            node.max_weight = max_weight
+
+    def _update_counts(self, path, change):
+        """Add the given change to the count of strings below each node on
+           the given path of nodes from the root, whose string was just made
+           terminal (a change of 1) or no longer terminal (a change of -1).
+
+           Runtime Complexity: O(m), where m is the length of the path.
+
+        """
+        for node in path:
+            node.count += change
+
+    def save(self, filename):
+        """Write this prefix tree to the given file in a compact binary format
+           that can be memory-mapped with PrefixTree.load.
 
-    def _find_node(self, string):
+           Runtime Complexity:
+           O(n * b * log(b)), where n is the number of nodes in the tree and b
+           is the largest number of children of a node.
+
+        """
+        save_prefix_tree(self, filename)
+
+    @staticmethod
+    def load(filename):
+        """Return a read-only MappedPrefixTree that answers contains and
+           complete queries directly from the given file saved by save.
+
+           Runtime Complexity:
+           O(1), since the file is memory-mapped rather than read into nodes.
+
+        """
+        return MappedPrefixTree(filename)
+
+    def _insert_sorted(self, strings):
+        """Insert the given strings, which must be in sorted order, into this
+           empty prefix tree in one pass. The nodes along the path of the
+           previous string are kept on a stack, so each string reuses the
+           nodes of its longest common prefix with the previous string and
+           only creates nodes for the rest of its characters.
+
+           Runtime Complexity:
+           O(n * m) for n strings of average length m, with exactly one
+           comparison per shared character and one new node per new character.
+           The cyclic garbage collector is paused during the build, as it
+           would otherwise repeatedly rescan every node created so far.
+
+        """
+        self._graft_sorted(_with_common_prefix_lengths(strings))
+
+    def _graft_sorted(self, pairs):
+        """Insert the strings of the given pairs of a string and the length of
+           its common prefix with the string before it, which must be in
+           sorted order without repeats, into this prefix tree built only from
+           sorted strings. The first string is walked from the root along any
+           nodes that already exist, so sorted runs of strings that share no
+           nodes past where the runs diverge can be grafted one after another.
+
+           Runtime Complexity:
+           O(n * m) for n strings of average length m, with one new node per
+           new character and no comparisons past the first string.
+
+        """
+        path = [self.root]
+        first = True
+        with _paused_gc():
+            for string, common in pairs:
+                if first is True:
+                    # walk the nodes that already exist for the first string
+                    for character in string:
+                        child = path[-1].children.get(character)
+                        if child is None:
+                            break
+                        path.append(child)
+                    common = len(path) - 1
+                    first = False
+                # drop the nodes that are past the common prefix
+                del path[common + 1:]
+                node = path[-1]
+                for character in string[common:]:
+                    # the string diverges here, so the child must be new
+                    child = PrefixTreeNode(character)
+                    child.max_weight = 0
+                    node.children[character] = child
+                    path.append(child)
+                    node = child
+                if node.terminal is False:
+                    node.terminal = True
+                    node.weight = 0
+                    self.size += 1
+                    for ancestor in path:
+                        ancestor.count += 1
+        if self.size > 0:
+            self.root.max_weight = 0
+
+    def _find_node(self, string, node=None, index=0):
         """Return a pair containing the deepest node in this prefix tree that
            matches the longest prefix of the given string and the node's depth.
            The depth returned is equal to the number of prefix characters
            matched. Search is done iteratively with a loop starting from the
-           root node.
+           root node, or from the given node whose path matches the first
+           index characters of the string.
 
            Runtime Complexity:
            The runtime of the is method linearly with the size of the string
@@ -107,13 +386,9 @@ class PrefixTree:
            of the longest string stored in the trie.
 
         """
-        # Match the empty string
-        if len(string) == 0:
-            return self.root, 0
         # Start with the root node
-        node = self.root
-        # loop through the letters in string
-        index = 0
+        if node is None:
+            node = self.root
         # on each iteration see it that letter is a child of node
         while index < len(string) and node.has_child(string[index]) is True:
             # if it is, then move node to that child, and move to next char
@@ -122,9 +397,11 @@ class PrefixTree:
         # return the pair of the node and the index
         return node, index
 
-    def complete(self, prefix):
+    def complete(self, prefix, k=None):
         """Return a list of all strings stored in this prefix tree that start
-           with the given prefix string.
+           with the given prefix string, in lexicographic order. If k is
+           given, return only the k strings with the highest weights, from
+           highest to lowest, breaking ties in lexicographic order.
 
            Runtime Complexity:
            The runtime of this method depends on the length of the prefix
@@ -136,23 +413,282 @@ class PrefixTree:
            longest string in the trie, so there less strings we need to create
            completions of - in this case the runtime tends towards
            O(m - prefix).
+           When k is given, only O(k * d) nodes are expanded, where d is the
+           depth of the subtree below the prefix, as the cached maximum
+           weights lead straight to the best strings.
+           If this prefix tree has a cache, cached results are copied in O(n)
+           time for n completions instead.
 
         """
+        if self.cache is None:
+            return self._complete(prefix, k)
+        completions = self.cache.get(prefix, k)
+        if completions is None:
+            completions = tuple(self._complete(prefix, k))
+            self.cache.put(prefix, k, completions)
+        return list(completions)
+
+    def _complete(self, prefix, k=None):
+        """Return a list of the completions of the given prefix, or of the k
+        completions with the highest weights if k is given, without using the
+        cache (see complete)."""
         # Create a list of completions in prefix tree
         completions = []
-        # Make sure user is not looking for all strings
-        if prefix == '':
-            return self.strings()
-        # init node to start traversal from
-        node = self._find_node(prefix)[0]
-        # if node has an empty string, there are no completions
-        if node.character != '':
-            self._traverse(node, prefix, completions.append)
-        # add remove words equal to the prefix
+        # init node to start traversal from, and the string on its path
+        node, path = self._find_completion_node(prefix)
+        # if no node matches the whole prefix, there are no completions
+        if node is None:
+            return completions
+        if k is None:
+            completions.extend(self._iter_subtree(node, path))
+        else:
+            self._traverse_best(node, path, k, completions.append)
         return completions
 
+    def fuzzy_contains(self, word, max_edits):
+        """Return True if this prefix tree contains a string that is within
+           the given number of edits (insertions, deletions or substitutions of
+           one character) of the given word.
+
+           Runtime Complexity:
+           Each node carries the row of the Levenshtein distance table between
+           the word and the node's path, computed in O(m) time from its
+           parent's row for a word of length m. A subtree is pruned as soon as
+           every entry of its row exceeds max_edits, since no longer path can
+           get closer, so only nodes within max_edits of a prefix of the word
+           are visited rather than every node in the tree.
+
+        """
+        stack = [(self.root, list(range(len(word) + 1)))]
+        while len(stack) > 0:
+            node, row = stack.pop()
+            if node.is_terminal() is True and row[-1] <= max_edits:
+                return True
+            for child in node.children.values():
+                child_row = row
+                for character in child.character:
+                    child_row = _next_edit_distance_row(child_row, character,
+                                                        word)
+                    if min(child_row) > max_edits:
+                        break
+                else:
+                    stack.append((child, child_row))
+        return False
+
+    def fuzzy_complete(self, prefix, max_edits):
+        """Return a list of all strings stored in this prefix tree that start
+           with a string within the given number of edits (insertions,
+           deletions or substitutions of one character) of the given prefix.
+
+           Runtime Complexity:
+           Rows of the Levenshtein distance table are carried down the tree as
+           in fuzzy_contains. Once a node's path is within max_edits of the
+           whole prefix, every string below it is a completion, so it is
+           traversed like complete() does without computing more rows, and
+           subtrees whose rows exceed max_edits everywhere are pruned.
+
+        """
+        completions = []
+        stack = [(self.root, '', list(range(len(prefix) + 1)))]
+        while len(stack) > 0:
+            node, path, row = stack.pop()
+            if row[-1] <= max_edits:
+                completions.extend(self._iter_subtree(node, path))
+                continue
+            # push the children in reverse so they are completed in order
+            for child in reversed(list(node.children.values())):
+                child_row = row
+                for character in child.character:
+                    child_row = _next_edit_distance_row(child_row, character,
+                                                        prefix)
+                    if (child_row[-1] <= max_edits or
+                            min(child_row) > max_edits):
+                        break
+                if min(child_row) <= max_edits:
+                    stack.append((child, path + child.character, child_row))
+        return completions
+
+    def match(self, pattern):
+        """Return a list of all strings stored in this prefix tree that match
+           the given pattern, in lexicographic order. As in fnmatch, '?'
+           matches any one character, '*' matches any run of characters
+           (including none), '[abc]' matches one of the characters in the
+           brackets, which may include ranges like 'a-z', or '[!abc]' one
+           character not in them, and any other character matches itself.
+
+           Runtime Complexity:
+           Each node carries the set of positions in the pattern that its path
+           can have reached, computed from its parent's set in O(p) time for a
+           pattern of p parts (or looked up, once the same step has been
+           taken from another node). A subtree is pruned as soon as the set is
+           empty, and when every position left is a literal character only
+           the children for those characters are looked up, so only nodes
+           whose path can still start a match are visited (though a pattern
+           that starts with '*' visits every node). Once the path has reached
+           a trailing '*', every string below it matches and the subtree is
+           traversed like complete() does.
+
+        """
+        parts = _parse_pattern(pattern)
+        accept = len(parts)
+        # a path that reaches a trailing '*' matches however it continues
+        open_ended = accept - 1 if accept > 0 and parts[-1] == ('*',) else None
+        # for each set of positions, the characters of its children to look
+        # up (or None for all children) and the sets that each character of
+        # a child's label leads to from it
+        moves = {}
+        matches = []
+        stack = [(self.root, '', _pattern_closure(parts, [0]))]
+        while len(stack) > 0:
+            node, path, states = stack.pop()
+            if open_ended in states:
+                matches.extend(self._iter_subtree(node, path))
+                continue
+            if accept in states and node.is_terminal() is True:
+                matches.append(path)
+            if states not in moves:
+                moves[states] = (_pattern_literals(parts, states), {})
+            literals = moves[states][0]
+            if literals is None:
+                children = list(node.children.values())
+            else:
+                children = [node.children[character]
+                            for character in literals
+                            if character in node.children]
+            # push the children in reverse so they are matched in order
+            for child in reversed(children):
+                child_states = states
+                for character in child.character:
+                    if child_states not in moves:
+                        moves[child_states] = (
+                            _pattern_literals(parts, child_states), {})
+                    steps = moves[child_states][1]
+                    next_states = steps.get(character)
+                    if next_states is None:
+                        next_states = _next_pattern_states(parts,
+                                                           child_states,
+                                                           character)
+                        steps[character] = next_states
+                    child_states = next_states
+                    if len(child_states) == 0:
+                        break
+                else:
+                    stack.append((child, path + child.character,
+                                  child_states))
+        return matches
+
+    def _find_completion_node(self, prefix, node=None, index=0):
+        """Return a pair containing the node below which all strings that
+           start with the given prefix are stored and the string on the path
+           to that node, or (None, None) if no stored string has the prefix.
+           The search starts from the root node, or from the given node whose
+           path matches the first index characters of the prefix.
+
+           Runtime Complexity: O(m), where m is the length of the prefix.
+
+        """
+        node, length = self._find_node(prefix, node, index)
+        if length < len(prefix):
+            return None, None
+        return node, prefix
+
+    def complete_many(self, prefixes):
+        """Return a dictionary that maps each of the given prefix strings to
+           the list of strings stored in this prefix tree that start with it,
+           in the same order as complete() returns them.
+
+           Runtime Complexity:
+           The prefixes are sorted, so consecutive prefixes share their
+           longest common prefix, and the nodes along the path of the
+           previous prefix are kept on a stack so that only the rest of each
+           prefix is walked, for O(p * log(p) + c) time to find the nodes of
+           p prefixes with c characters in total that are not shared. Each
+           prefix that does not start with another given prefix has its
+           subtree traversed once, and the completions of the prefixes nested
+           inside it are sliced from that traversal as their nodes are left.
+
+        """
+        completions = {}
+        # Nodes whose whole paths match the previous prefix, and path lengths
+        matched = [(self.root, 0)]
+        previous = ''
+        # The outermost prefix of the current group, its completion node and
+        # path, and the prefixes nested inside it keyed by their node ids
+        outer = None
+        nested = {}
+        for prefix in sorted(set(prefixes)):
+            # walk back up to the longest common prefix with the previous one
+            common = _common_prefix_length(previous, prefix, 0)
+            while matched[-1][1] > common:
+                matched.pop()
+            node, index = matched[-1]
+            while index < len(prefix):
+                child = node.children.get(prefix[index])
+                if child is None or prefix.startswith(child.character,
+                                                      index) is False:
+                    break
+                node, index = child, index + len(child.character)
+                matched.append((node, index))
+            previous = prefix
+            node, path = self._find_completion_node(prefix, node, index)
+            if outer is not None and prefix.startswith(outer[0]):
+                # complete this prefix from the traversal of the outer prefix
+                if node is None:
+                    completions[prefix] = []
+                else:
+                    nested.setdefault(id(node), []).append(prefix)
+                continue
+            if outer is not None:
+                self._complete_nested(outer, nested, completions)
+            outer, nested = (prefix, node, path), {}
+        if outer is not None:
+            self._complete_nested(outer, nested, completions)
+        return completions
+
+    def _complete_nested(self, outer, nested, completions):
+        """Add the completions of the given outer (prefix, node, path) triple
+           and of the prefixes nested inside it, given as lists of prefixes
+           keyed by the ids of their completion nodes, to the given dictionary
+           of completions, with one traversal of the outer prefix's node.
+
+           Runtime Complexity:
+           O(n + k), where n is the number of nodes below the outer prefix's
+           node and k is the total number of completions copied. The cyclic
+           garbage collector is paused, as the traversal allocates many short
+           lived objects that would make it rescan the whole tree repeatedly.
+
+        """
+        prefix, node, path = outer
+        results = []
+        completions[prefix] = results
+        if node is None:
+            return
+        if node.is_terminal() is True:
+            results.append(path)
+        labels = [path]
+        # Each stack entry is a node, an iterator over its children and the
+        # number of results found before the node was entered
+        stack = [(node, iter(node.children.values()), 0)]
+        with _paused_gc():
+            while len(stack) > 0:
+                node, children, start = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    # this node is done, so its completions are all found
+                    stack.pop()
+                    labels.pop()
+                    for nested_prefix in nested.get(id(node), ()):
+                        completions[nested_prefix] = results[start:]
+                    continue
+                start = len(results)
+                labels.append(child.character)
+                if child.is_terminal() is True:
+                    results.append(''.join(labels))
+                stack.append((child, iter(child.children.values()), start))
+
     def strings(self):
-        """Return a list of all strings stored in this prefix tree.
+        """Return a list of all strings stored in this prefix tree, in
+          lexicographic order.
 
           Runtime Complexity:
           This method performs a depth first traversal from the root, meaning
@@ -164,42 +700,408 @@ class PrefixTree:
 
         """
         # Create a list of all strings in prefix tree
-        all_strings = []
-        self._traverse(self.root, '', all_strings.append)
-        return all_strings
+        return list(self._iter_subtree(self.root, ''))
+
+    def iter_complete(self, prefix, cursor=None):
+        """Generate all strings stored in this prefix tree that start with the
+           given prefix string, lazily and in the same order as complete().
+           If a cursor returned by complete_page() is given, resume right
+           after the string it was created for, even if that string has been
+           deleted since.
+
+           Runtime Complexity:
+           The first string is generated after O(m + d) steps, where m is the
+           length of the prefix and d is the depth of the first terminal node
+           below it, regardless of how many strings have the prefix. Resuming
+           from a cursor walks down the path of its string once, scanning
+           past at most b siblings per node, rather than regenerating every
+           string before it.
+
+        """
+        node, path = self._find_completion_node(prefix)
+        if node is None:
+            return
+        after = None
+        if cursor is not None:
+            after = _decode_cursor(cursor)
+            if after.startswith(path) is False:
+                raise ValueError(f'Cursor does not continue prefix {prefix!r}')
+        yield from self._iter_subtree(node, path, after)
+
+    def complete_page(self, prefix, limit, cursor=None):
+        """Return a pair containing a list of at most limit strings that start
+           with the given prefix and an opaque cursor string to pass back in to
+           get the next page, or None if there are no more strings. Strings
+           are paged in the same order as complete() returns them. Raise
+           ValueError if the limit is less than one.
+
+           Runtime Complexity:
+           O(m + p * d), where m is the length of the prefix (or the string of
+           the cursor), p is the limit and d is the depth of the subtree.
+
+        """
+        if limit < 1:
+            raise ValueError(f'Page limit must be at least 1, not {limit!r}')
+        completions = self.iter_complete(prefix, cursor)
+        page = list(itertools.islice(completions, limit))
+        # Only hand out a cursor if another string follows this page
+        if len(page) == 0 or next(completions, None) is None:
+            return page, None
+        return page, _encode_cursor(page[-1])
+
+    def count_prefix(self, prefix):
+        """Return the number of strings stored in this prefix tree that start
+           with the given prefix string, without retrieving them.
+
+           Runtime Complexity:
+           O(m), where m is the length of the prefix, since every node keeps a
+           count of the strings below it.
+
+        """
+        node, path = self._find_completion_node(prefix)
+        return node.count if node is not None else 0
+
+    def rank(self, string):
+        """Return the number of strings stored in this prefix tree that are
+           less than the given string, which is its index in lexicographic
+           order if it is stored.
+
+           Runtime Complexity:
+           O(m * b), where m is the length of the string and b is the largest
+           number of children of a node along its path, whose counts are
+           added up while they come before the path.
+
+        """
+        node, index, rank = self.root, 0, 0
+        while index < len(string):
+            # A string that ends here is a prefix of the given string
+            if node.is_terminal() is True:
+                rank += 1
+            character = string[index]
+            for key, child in node.children.items():
+                if key >= character:
+                    break
+                rank += child.count
+            if node.has_child(character) is False:
+                return rank
+            child = node.get_child(character)
+            if string.startswith(child.character, index) is False:
+                # The string diverges from (or ends partway along) the label
+                if child.character < string[index:]:
+                    rank += child.count
+                return rank
+            node = child
+            index += len(child.character)
+        return rank
+
+    def select(self, index):
+        """Return the string at the given index in lexicographic order of the
+           strings stored in this prefix tree, or raise IndexError if there is
+           no such string.
+
+           Runtime Complexity:
+           O(d * b), where d is the depth of the string and b is the largest
+           number of children of a node along its path, which are skipped by
+           their counts.
+
+        """
+        if index < 0 or index >= self.size:
+            raise IndexError(f'String index out of range: {index}')
+        node, labels = self.root, [self.root.character]
+        while True:
+            if node.is_terminal() is True:
+                if index == 0:
+                    return ''.join(labels)
+                index -= 1
+            for child in node.children.values():
+                if index < child.count:
+                    break
+                index -= child.count
+            node = child
+            labels.append(child.character)
+
+    def strings_between(self, low, high):
+        """Return a list of the strings stored in this prefix tree that are at
+           least the given low string and less than the given high string, in
+           lexicographic order.
+
+           Runtime Complexity:
+           O(m * b + k * d), where m is the length of the low string, b is the
+           largest number of children of a node along its path and k is the
+           number of strings in the range, of depth at most d. Only the path
+           of the low string and the nodes of the strings in the range (and
+           of the first string past it) are visited.
+
+        """
+        strings = []
+        if low >= high:
+            return strings
+        if self.contains(low) is True:
+            strings.append(low)
+        for string in self._iter_subtree(self.root, '', low):
+            if string >= high:
+                break
+            strings.append(string)
+        return strings
+
+    def successor(self, string):
+        """Return the smallest string stored in this prefix tree that is
+           greater than the given string, which does not need to be stored, or
+           None if there is no such string.
+
+           Runtime Complexity:
+           O(m * b + d), where m is the length of the string, b is the largest
+           number of children of a node along its path and d is the depth of
+           the successor below where its path leaves the string's path.
+
+        """
+        return next(self._iter_subtree(self.root, '', string), None)
+
+    def predecessor(self, string):
+        """Return the largest string stored in this prefix tree that is less
+           than the given string, which does not need to be stored, or None if
+           there is no such string.
+
+           Runtime Complexity:
+           O((m + d) * b), where m is the length of the string, d is the depth
+           of the predecessor below where its path leaves the string's path
+           and b is the largest number of children of a node along them.
+
+        """
+        # The deepest node along the path of the string whose largest string
+        # is the predecessor, or None if it is the path itself, and its path
+        best, path = None, None
+        node, index = self.root, 0
+        while index < len(string):
+            # A string that ends here is a prefix of the given string
+            if node.is_terminal() is True:
+                best, path = None, string[:index]
+            character = string[index]
+            for key, child in node.children.items():
+                if key >= character:
+                    break
+                # The largest string below the last earlier child is larger
+                best, path = child, string[:index] + child.character
+            if node.has_child(character) is False:
+                break
+            child = node.get_child(character)
+            if string.startswith(child.character, index) is False:
+                # The string diverges from (or ends partway along) the label
+                if child.character < string[index:]:
+                    best, path = child, string[:index] + child.character
+                break
+            node = child
+            index += len(child.character)
+        if best is None:
+            return path
+        # The largest string below a node is found along its last children
+        labels = [path]
+        while best.num_children() > 0:
+            best = next(reversed(best.children.values()))
+            labels.append(best.character)
+        return ''.join(labels)
+
+    def prefixes_of(self, text):
+        """Return a list of the strings stored in this prefix tree that are
+           prefixes of the given text, from shortest to longest.
+
+           Runtime Complexity:
+           O(m + k), where m is the length of the longest path in this prefix
+           tree that matches the start of the text and k is the total length
+           of the prefixes found, which are all found in one walk.
+
+        """
+        prefixes = []
+        node, index = self.root, 0
+        while True:
+            if node.is_terminal() is True:
+                prefixes.append(text[:index])
+            if index == len(text):
+                return prefixes
+            child = node.children.get(text[index])
+            if child is None or text.startswith(child.character,
+                                                index) is False:
+                return prefixes
+            node = child
+            index += len(child.character)
+
+    def longest_prefix_of(self, text):
+        """Return the longest string stored in this prefix tree that is a
+           prefix of the given text, or None if there is no such string.
+
+           Runtime Complexity:
+           O(m), where m is the length of the longest path in this prefix tree
+           that matches the start of the text, in one walk.
+
+        """
+        length, open_ended = self._longest_prefix_length(text)
+        return text[:length] if length is not None else None
+
+    def tokenize(self, text):
+        """Generate the tokens of the given text, which is a string or an
+           iterable of strings (such as the lines of a file) that are read one
+           at a time, split greedily from left to right: each token is the
+           longest string stored in this prefix tree that starts where the
+           previous token ended, or the single character there if no stored
+           string (other than the empty string) does. Tokens may span the
+           boundaries between strings of an iterable.
+
+           Runtime Complexity:
+           O(n * t), where n is the length of the text and t is the length of
+           the longest path in this prefix tree that matches the text at the
+           start of a token, which is walked once for each token.
+
+        """
+        chunks = [text] if isinstance(text, str) else text
+        buffer = ''
+        for chunk in chunks:
+            buffer += chunk
+            start = 0
+            while start < len(buffer):
+                length, open_ended = self._longest_prefix_length(buffer,
+                                                                 start)
+                if open_ended is True:
+                    # the next chunk may extend the token, so wait for it
+                    break
+                length = length or 1
+                yield buffer[start:start + length]
+                start += length
+            buffer = buffer[start:]
+        start = 0
+        while start < len(buffer):
+            length = self._longest_prefix_length(buffer, start)[0] or 1
+            yield buffer[start:start + length]
+            start += length
+
+    def _longest_prefix_length(self, text, start=0):
+        """Return a pair of the length of the longest string stored in this
+        prefix tree that is a prefix of the given text from the given index,
+        or None if there is no such string, and whether the text ends before
+        the walk leaves the tree, so more text could make a longer match."""
+        node, index, longest = self.root, start, None
+        while True:
+            if node.is_terminal() is True:
+                longest = index - start
+            if index == len(text):
+                return longest, True
+            child = node.children.get(text[index])
+            if child is None:
+                return longest, False
+            label = child.character
+            if text.startswith(label, index) is False:
+                # the text may end partway along the label
+                return longest, (len(text) - index < len(label) and
+                                 label.startswith(text[index:]))
+            node = child
+            index += len(label)
 
     def _traverse(self, node, prefix, visit):
-        """Traverse this prefix tree with recursive depth-first traversal.
+        """Traverse this prefix tree with depth-first traversal.
            Start at the given node with the given prefix representing its path
-           in this prefix tree and visit each node with the given visit
-           function.
-
-           Runtime Complexity:
-           The runtime of this method grows with respect to the number of
-           strings we need to traverse, as well as the length of each of the
-           strings. This will be give or take O(m * n), where m is the length
-           of the longest string, and n is the number of retrieved strings.
-           In the best case, the prefixes in the longest string will actually
-           be the other, smaller strings, which will decrease the runtime by
-           reducing the number of times we need to recursively invoke this
-           method. In that scenario, the runtime tends towards O(m).
-
-        """
-        if node.is_terminal() is True and len(node.children) == 0:
-            # add the prefix phrase we've built so far
-            visit(prefix)
-        elif node.is_terminal() is True:
-            # add the prefix phrase we've built so far, and keep moving down
-            visit(prefix)
-        for char in node.children.keys():
-            # move to the child node, continually build the string in traversal
-            child = node.get_child(char)
-            string = self._traverse(child, prefix + char, visit)
+           in this prefix tree and visit each string stored below it with the
+           given visit function.
+
+           Runtime Complexity:
+           O(n * m), where n is the number of strings below the node and m is
+           the length of the longest one (see _iter_subtree).
+
+        """
+        for string in self._iter_subtree(node, prefix):
+            visit(string)
+
+    def _iter_subtree(self, node, prefix, after=None):
+        """Generate each string stored below the given node, whose path in
+           this prefix tree is the given prefix, with an iterative depth-first
+           traversal. If a string is given after which to resume, which does
+           not need to be stored, skip every string up to and including it.
+
+           Runtime Complexity:
+           The traversal keeps an explicit stack holding an iterator over the
+           children of each node on the current path, and a list of the labels
+           along that path, so each node is visited once and each string is
+           joined once, in O(n * m) total time for n strings of length m,
+           without building a new string at every level.
+
+        """
+        labels = [prefix]
+        stack = [iter(node.children.values())]
+        if after is None:
+            if node.is_terminal() is True:
+                yield prefix
+        else:
+            # Rebuild the stack along the path of the string to resume after,
+            # leaving only the children at each node that come after it
+            index = len(prefix)
+            while index < len(after):
+                character = after[index]
+                later = [sibling for key, sibling in node.children.items()
+                         if key > character]
+                child = node.children.get(character)
+                if child is not None and after.startswith(child.character,
+                                                          index) is True:
+                    stack[-1] = iter(later)
+                    labels.append(child.character)
+                    stack.append(iter(child.children.values()))
+                    node = child
+                    index += len(child.character)
+                    continue
+                # The string leaves the tree here, and all of the child's
+                # strings come after it if its label does
+                if child is not None and child.character > after[index:]:
+                    later.insert(0, child)
+                stack[-1] = iter(later)
+                break
+        while len(stack) > 0:
+            child = next(stack[-1], None)
+            if child is None:
+                # all children of this node are done, so move back up
+                stack.pop()
+                labels.pop()
+                continue
+            labels.append(child.character)
+            if child.is_terminal() is True:
+                yield ''.join(labels)
+            stack.append(iter(child.children.values()))
+
+    def _traverse_best(self, node, prefix, k, visit):
+        """Visit the k strings with the highest weights stored below the given
+           node, whose path in this prefix tree is the given prefix, from the
+           highest weight to the lowest with a best-first search.
+
+           Runtime Complexity:
+           Subtrees are expanded in order of their cached maximum weight, and
+           every expanded subtree leads to at least one of the k best strings,
+           so O(k * d) nodes are expanded, where d is the depth of the subtree.
+           Each expansion pushes a node's children onto a heap, which adds a
+           factor of O(b * log(k * d * b)) for nodes with b children.
+
+        """
+        if k <= 0 or node.max_weight is None:
+            return
+        # Heap entries are ordered by descending weight, then by string, and
+        # a string is ordered before the subtree whose path it is
+        heap = [(-node.max_weight, prefix, 1, node)]
+        while len(heap) > 0:
+            weight, string, is_subtree, node = heapq.heappop(heap)
+            if is_subtree == 0:
+                visit(string)
+                k -= 1
+                if k == 0:
+                    return
+                continue
+            if node.is_terminal():
+                heapq.heappush(heap, (-node.weight, string, 0, None))
+            for child in node.children.values():
+                if child.max_weight is not None:
+                    heapq.heappush(heap, (-child.max_weight,
+                                          string + child.character, 1, child))
 
     def delete(self, key):
-        """Removes all nodes containing letters of the given key to delete.
-           Other keys whose keys are destroyed in the process are then
-           re-inserted.
+        """Removes the given key from the trie by walking down its path and
+           marking its last node as no longer terminal, or raises ValueError
+           if the key is not stored. Nodes on the path that are left with no
+           strings below them are then pruned, from the end of the key back
+           up toward the root, so deleted keys leave no dead branches.
 
            Parameters:
            key(str): the entry being deleted from the trie.
@@ -207,29 +1109,137 @@ class PrefixTree:
            Returns: None
 
            Complexity Analysis:
-           The runtime of this method asymptotically increases with the time it
-           takes to check all strings in the tree, so that we know that the key
-           is even a valid input. After that, we must also traverse the key to
-           set the .terminal property of its last node to False, so that the
-           whole string will no longer be found during depth first searches.
-           The runtime of the second step asymptotically grows with the length
-           of the key being deleted. Overall the runtime of this method can be
-           expressed as O(k + (n * m)), where k is the length of the string
-           being deleted, and (n * m) represents the time it takes to check if
-           the input string is contained within the trie. In the worst case
-           scenario, the key (aka string) being deleted is also the longest
-           string in the data structure.
-
-        """
-        if self.contains(key) is True:  # O(m * n)
+           O(m * b), where m is the length of the key and b is the largest
+           number of children of a node along its path: the path is walked
+           down once, and walked back up to prune nodes and to update the
+           cached maximum weights of the subtrees that contained the key.
+
+        """
+        node = self.root
+        path = [node]
+        for character in key:
+            if node.has_child(character) is False:
+                break
+            node = node.get_child(character)
+            path.append(node)
+        if len(path) == len(key) + 1 and node.is_terminal() is True:
             # set the node at the end of key no longer signal end of a node
-            last_node, depth = self._find_node(key[-1])  # O(m)
-            last_node.terminal = False
+            node.terminal = False
+            node.weight = None
             # decrement size of tree
             self.size -= 1
+            self._update_counts(path, -1)
+            # remove nodes that no longer lead to any string
+            while (len(path) > 1 and path[-1].is_terminal() is False and
+                   path[-1].num_children() == 0):
+                child = path.pop()
+                del path[-1].children[child.character[0]]
+            self._update_weights(path)
+            self._invalidate(key)
         else:  # key is not actually in the prefix tree
             raise ValueError('Word is not found and cannot be deleted.')
 
+    def compact(self):
+        """Reclaim memory after many deletes: prune any nodes that do not
+           lead to a stored string and rebuild every children dictionary at
+           its current size, since Python dictionaries never shrink when
+           items are deleted from them. Return the number of nodes pruned.
+
+           Runtime Complexity:
+           O(n), where n is the number of nodes in this prefix tree, which
+           are visited once each in post-order.
+
+        """
+        pruned = 0
+        # Each stack entry is a node and whether its children are compacted
+        stack = [(self.root, False)]
+        while len(stack) > 0:
+            node, visited = stack.pop()
+            if visited is False:
+                stack.append((node, True))
+                stack.extend((child, False)
+                             for child in node.children.values())
+                continue
+            children = PrefixTreeNode.CHILDREN_TYPE()
+            for character, child in node.children.items():
+                if child.is_terminal() is False and child.num_children() == 0:
+                    pruned += 1
+                else:
+                    children[character] = child
+            node.children = children
+        return pruned
+
+    def stats(self):
+        """Return a dictionary of statistics about the shape and memory use of
+           this prefix tree, whose values are all numbers or lists of numbers,
+           so it can be exported with json.dumps (see stats_json):
+           num_nodes and num_terminals count the nodes and the nodes that
+           terminate a string; height is the depth of the deepest node (the
+           root is at depth 0); depth_histogram and terminal_depth_histogram
+           count all nodes and terminal nodes at each depth, and
+           branching_histogram counts the nodes with each number of children.
+           Nodes other than the root that have one child and do not terminate
+           a string would be merged into their child by path compression (as
+           in a RadixTree): compressible_nodes counts them, single_child_chains
+           counts the runs of them along paths and chain_length_histogram
+           counts the runs of each length. memory_bytes estimates the bytes
+           used by the nodes with sys.getsizeof of each node, its children
+           dictionary and its label, if longer than one character (single
+           characters are interned by Python), which bytes_per_node and
+           bytes_per_word divide by the numbers of nodes and strings.
+
+           Runtime Complexity:
+           O(n), where n is the number of nodes in this prefix tree, which
+           are visited once each.
+
+        """
+        depths, terminal_depths, branching = [], [], []
+        chain_lengths = [0]
+        num_terminals = memory_bytes = 0
+        # Each stack entry is a node, its depth and the length of the run of
+        # compressible nodes that ends at its parent
+        stack = [(self.root, 0, 0)]
+        while len(stack) > 0:
+            node, depth, run = stack.pop()
+            num_children = len(node.children)
+            _count_at(depths, depth)
+            _count_at(branching, num_children)
+            if node.is_terminal() is True:
+                num_terminals += 1
+                _count_at(terminal_depths, depth)
+            memory_bytes += sys.getsizeof(node) + sys.getsizeof(node.children)
+            if len(node.character) > 1:
+                memory_bytes += sys.getsizeof(node.character)
+            if (node is not self.root and num_children == 1 and
+                    node.is_terminal() is False):
+                run += 1
+            elif run > 0:
+                _count_at(chain_lengths, run)
+                run = 0
+            stack.extend((child, depth + 1, run)
+                         for child in node.children.values())
+        num_nodes = sum(depths)
+        return {
+            'num_nodes': num_nodes,
+            'num_terminals': num_terminals,
+            'height': len(depths) - 1,
+            'depth_histogram': depths,
+            'terminal_depth_histogram': terminal_depths,
+            'branching_histogram': branching,
+            'compressible_nodes': sum(length * count for length, count
+                                      in enumerate(chain_lengths)),
+            'single_child_chains': sum(chain_lengths),
+            'chain_length_histogram': chain_lengths,
+            'memory_bytes': memory_bytes,
+            'bytes_per_node': memory_bytes / num_nodes,
+            'bytes_per_word': memory_bytes / max(self.size, 1),
+        }
+
+    def stats_json(self, indent=None):
+        """Return the statistics from stats() as a JSON string, indented by
+        the given number of spaces, if any."""
+        return json.dumps(self.stats(), indent=indent)
+
 
 def create_prefix_tree(strings):
     print(f'strings: {strings}')
@@ -293,8 +1303,412 @@ def main():
 
 
 class RadixTree(PrefixTree):
-    '''A compact prefix tree.'''
-    pass
+    """RadixTree: A compact prefix tree in which every chain of nodes that
+       have only one child and do not terminate a string is compressed into a
+       single node. Each node stores a label (a substring, rather than a single
+       character) on the edge leading to it from its parent, and children are
+       keyed by the first character of their labels.
+
+       Nodes are split when an inserted string diverges partway along a label,
+       and merged back into their only child when a deletion leaves them
+       redundant, so the tree never holds more than 2n nodes for n strings.
+
+    """
+
+    def contains(self, string):
+        """Return True if this radix tree contains the given string.
+
+           Runtime Complexity:
+           O(m), where m is the length of the string being searched. Only one
+           dictionary lookup is needed per label on the path, rather than one
+           per character.
+
+        """
+        node, length = self._find_node(string)
+        return length == len(string) and node.is_terminal()
+
+    def insert(self, string, weight=None):
+        """Insert the given string into this radix tree with the given weight
+           (see PrefixTree.insert), splitting the label of the node where the
+           string diverges from the stored strings.
+
+           Runtime Complexity:
+           O(m), where m is the length of the string being inserted. At most
+           one node is split and one new leaf node is created.
+
+        """
+        node, index = self.root, 0
+        path = [node]
+        while index < len(string):
+            character = string[index]
+            if node.has_child(character) is False:
+                # No stored string shares this edge, so add the rest as a leaf
+                node = PrefixTreeNode(string[index:])
+                path[-1].add_child(character, node)
+                path.append(node)
+                break
+            child = node.get_child(character)
+            label = child.character
+            common = _common_prefix_length(label, string, index)
+            if common == len(label):
+                # The whole label matches, so move down to the child
+                node = child
+                path.append(node)
+                index += common
+                continue
+            # The string diverges partway along the label, so split the child
+            middle = PrefixTreeNode(label[:common])
+            child.character = label[common:]
+            middle.add_child(child.character[0], child)
+            middle.max_weight = child.max_weight
+            middle.count = child.count
+            node.children[character] = middle
+            node = middle
+            path.append(node)
+            index += common
+        if node.is_terminal() is False:
+            node.terminal = True
+            self.size += 1
+            self._update_counts(path, 1)
+            node.weight = 0 if weight is None else weight
+        elif weight is not None:
+            node.weight = weight
+        else:
+            # the string is already stored and keeps its weight
+            return
+        self._update_weights(path)
+        self._invalidate(string)
+
+    def _graft_sorted(self, pairs):
+        """Insert the strings of the given pairs of a string and the length of
+        its common prefix with the string before it into this radix tree one
+        at a time, since labels split as strings diverge."""
+        for string, common in pairs:
+            self.insert(string)
+
+    def _find_node(self, string, node=None, index=0):
+        """Return a pair containing the deepest node in this radix tree whose
+           full path matches a prefix of the given string and the number of
+           characters of the string matched along that path, searching from
+           the root node or from the given node whose path matches the first
+           index characters of the string.
+
+           Runtime Complexity:
+           O(m), where m is the length of the given string.
+
+        """
+        if node is None:
+            node = self.root
+        while index < len(string) and node.has_child(string[index]) is True:
+            child = node.get_child(string[index])
+            if string.startswith(child.character, index) is False:
+                break
+            node = child
+            index += len(child.character)
+        return node, index
+
+    def _find_completion_node(self, prefix, node=None, index=0):
+        """Return a pair containing the node below which all strings that
+           start with the given prefix are stored and the string on the path
+           to that node, or (None, None) if no stored string has the prefix.
+           The prefix may end partway along the label of a node, in which case
+           all strings below that node match. The search starts from the root
+           node, or from the given node whose path matches the first index
+           characters of the prefix.
+
+           Runtime Complexity: O(m), where m is the length of the prefix.
+
+        """
+        node, index = self._find_node(prefix, node, index)
+        if index == len(prefix):
+            return node, prefix
+        if node.has_child(prefix[index]) is False:
+            return None, None
+        child = node.get_child(prefix[index])
+        if child.character.startswith(prefix[index:]) is False:
+            return None, None
+        # Complete from the child whose label extends past the prefix
+        return child, prefix[:index] + child.character
+
+    def delete(self, key):
+        """Remove the given key from this radix tree, or raise ValueError if
+           it is not stored. Nodes left without a purpose are removed, and a
+           non-terminal node left with a single child is merged into it, so the
+           tree stays as compact as if the key had never been inserted.
+
+           Runtime Complexity:
+           O(m), where m is the length of the key being deleted.
+
+        """
+        node, index = self.root, 0
+        path = [node]
+        while index < len(key) and node.has_child(key[index]) is True:
+            child = node.get_child(key[index])
+            if key.startswith(child.character, index) is False:
+                break
+            node = child
+            path.append(node)
+            index += len(child.character)
+        if index < len(key) or node.is_terminal() is False:
+            raise ValueError('Word is not found and cannot be deleted.')
+        node.terminal = False
+        node.weight = None
+        self.size -= 1
+        self._update_counts(path, -1)
+        if node is not self.root and node.num_children() == 0:
+            # Remove the leaf, then its parent may have become redundant
+            path.pop()
+            del path[-1].children[node.character[0]]
+            node = path[-1]
+        if node is not self.root:
+            self._merge_with_only_child(node)
+        self._update_weights(path)
+        self._invalidate(key)
+
+    def _finish_adoption(self, created):
+        """Set the counts and weights of the given nodes created by
+        _adopt_shard and merge each of them that does not terminate a string
+        with its only child, from the root down, so every path is compressed
+        (see PrefixTree.from_parallel)."""
+        super()._finish_adoption(created)
+        created = set(map(id, created))
+        stack = [self.root]
+        while len(stack) > 0:
+            node = stack.pop()
+            if node is not self.root:
+                while node.is_terminal() is False and node.num_children() == 1:
+                    self._merge_with_only_child(node)
+            stack.extend(child for child in node.children.values()
+                         if id(child) in created)
+
+    def _merge_with_only_child(self, node):
+        """Merge the given non-terminal node with its child if it has exactly
+           one, by appending the child's label to its own and adopting the
+           child's children and terminal flag."""
+        if node.is_terminal() is False and node.num_children() == 1:
+            child = next(iter(node.children.values()))
+            node.character += child.character
+            node.children = child.children
+            node.terminal = child.terminal
+            node.weight = child.weight
+
+
+def _encode_cursor(string):
+    """Return an opaque cursor string that resumes after the given string."""
+    return base64.urlsafe_b64encode(string.encode('utf-8')).decode('ascii')
+
+
+def _decode_cursor(cursor):
+    """Return the string that the given cursor resumes after, or raise
+    ValueError if the cursor is malformed."""
+    try:
+        return base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+    except (ValueError, UnicodeError):
+        raise ValueError(f'Malformed cursor {cursor!r}')
+
+
+@contextlib.contextmanager
+def _paused_gc():
+    """Pause the cyclic garbage collector, if it is enabled, while creating
+    many objects that it would otherwise repeatedly rescan along with every
+    node of a large tree, and resume it afterward."""
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if collecting is True:
+            gc.enable()
+
+
+def _in_sorted_order(strings):
+    """Generate the given strings without repeats, or raise ValueError if
+    they are not in sorted order."""
+    previous = None
+    for string in strings:
+        if previous is not None and string <= previous:
+            if string == previous:
+                continue
+            raise ValueError(f'String {string!r} is out of sorted order')
+        yield string
+        previous = string
+
+
+def _with_common_prefix_lengths(strings):
+    """Generate pairs of each of the given strings, without repeats, and the
+    length of its common prefix with the string before it, or raise
+    ValueError if they are not in sorted order."""
+    previous = ''
+    for string in _in_sorted_order(strings):
+        yield string, _common_prefix_length(previous, string, 0)
+        previous = string
+
+
+def _build_shard(cls, strings):
+    """Return the flat form of a prefix tree of the given class that stores
+    the given strings, which PrefixTree.from_parallel adopts: a list of the
+    labels of its nodes in breadth-first order, an array of the index of the
+    first child of each node followed by the number of nodes, an array of the
+    count of each node and the terminal flag of each node."""
+    tree = cls.from_sorted(sorted(strings))
+    labels, first, counts, terminals = [], array('I'), array('I'), bytearray()
+    # The children of each node are appended to the list as it is iterated
+    nodes = [tree.root]
+    for node in nodes:
+        labels.append(node.character)
+        first.append(len(nodes))
+        nodes.extend(node.children.values())
+        counts.append(node.count)
+        terminals.append(node.terminal)
+    first.append(len(nodes))
+    return labels, first, counts, bytes(terminals)
+
+
+def _create_shard_children(labels, first, counts, terminals):
+    """Return a new children dictionary of the root of the given flat form of
+    a prefix tree (see _build_shard), in sorted order, with every node below
+    it created from the flat form in breadth-first order."""
+    children_type = PrefixTreeNode.CHILDREN_TYPE
+    new_node = PrefixTreeNode.__new__
+    # The children dictionary of each node, in breadth-first order, which
+    # grows as it is iterated since every child comes after its parent
+    children = [children_type()]
+    child = 1
+    for parent_children, end in zip(children, first[1:]):
+        while child < end:
+            # skip __init__, since every slot is set here
+            node = new_node(PrefixTreeNode)
+            node.children = node_children = children_type()
+            children.append(node_children)
+            node.character = label = labels[child]
+            if terminals[child] == 1:
+                node.terminal = True
+                node.weight = 0
+            else:
+                node.terminal = False
+                node.weight = None
+            node.max_weight = 0
+            node.count = counts[child]
+            parent_children[label[0]] = node
+            child += 1
+    return children[0]
+
+
+def _next_edit_distance_row(row, character, word):
+    """Return the next row of the Levenshtein distance table between the given
+    word and a path of characters, given the row for the path so far and the
+    character that extends it."""
+    next_row = [row[0] + 1]
+    for index in range(1, len(row)):
+        next_row.append(min(next_row[index - 1] + 1,
+                            row[index] + 1,
+                            row[index - 1] + (word[index - 1] != character)))
+    return next_row
+
+
+def _count_at(histogram, index):
+    """Add one to the count at the given index of the given histogram list,
+    extending it with zero counts up to the index first if it is short."""
+    if index >= len(histogram):
+        histogram.extend([0] * (index + 1 - len(histogram)))
+    histogram[index] += 1
+
+
+def _parse_pattern(pattern):
+    """Return a list of the parts of the given wildcard pattern: ('char', c)
+    for a literal character c, ('?',) for any one character, ('*',) for any
+    run of characters, and ('class', negated, ranges) for a bracketed class
+    of characters, where ranges is a tuple of (first, last) pairs. As in
+    fnmatch, a '[' without a closing ']' is a literal character."""
+    parts = []
+    index = 0
+    while index < len(pattern):
+        character = pattern[index]
+        index += 1
+        if character == '*':
+            if len(parts) == 0 or parts[-1] != ('*',):
+                parts.append(('*',))
+        elif character == '?':
+            parts.append(('?',))
+        elif character == '[':
+            # a ']' right after '[' or '[!' is part of the class
+            start = index + 1 if pattern.startswith('!', index) else index
+            end = pattern.find(']', start + 1)
+            if end == -1:
+                parts.append(('char', character))
+                continue
+            body = pattern[start:end]
+            ranges = []
+            position = 0
+            while position < len(body):
+                if position + 2 < len(body) and body[position + 1] == '-':
+                    ranges.append((body[position], body[position + 2]))
+                    position += 3
+                else:
+                    ranges.append((body[position], body[position]))
+                    position += 1
+            parts.append(('class', start > index, tuple(ranges)))
+            index = end + 1
+        else:
+            parts.append(('char', character))
+    return parts
+
+
+def _pattern_closure(parts, states):
+    """Return a frozenset of the given positions in the given pattern parts
+    and every position after a run of '*' parts that they can skip."""
+    closure = set()
+    for state in states:
+        closure.add(state)
+        while state < len(parts) and parts[state] == ('*',):
+            state += 1
+            closure.add(state)
+    return frozenset(closure)
+
+
+def _pattern_literals(parts, states):
+    """Return a sorted list of the characters that can extend a path at the
+    given positions in the given pattern parts, if they are all literal
+    characters, or None if other parts match characters too."""
+    literals = []
+    for state in states:
+        if state == len(parts):
+            continue
+        if parts[state][0] != 'char':
+            return None
+        literals.append(parts[state][1])
+    return sorted(literals)
+
+
+def _next_pattern_states(parts, states, character):
+    """Return a frozenset of the positions in the given pattern parts that a
+    path can reach from the given positions by matching the given
+    character."""
+    next_states = []
+    for state in states:
+        if state == len(parts):
+            continue
+        part = parts[state]
+        if part[0] == '*':
+            next_states.append(state)
+        elif part[0] == '?' or (part[0] == 'char' and part[1] == character):
+            next_states.append(state + 1)
+        elif part[0] == 'class':
+            negated, ranges = part[1], part[2]
+            if any(first <= character <= last
+                   for first, last in ranges) is not negated:
+                next_states.append(state + 1)
+    return _pattern_closure(parts, next_states)
+
+
+def _common_prefix_length(label, string, start):
+    """Return the number of leading characters of the given label that match
+    the given string starting at the given index of the string."""
+    length = 0
+    limit = min(len(label), len(string) - start)
+    while length < limit and label[length] == string[start + length]:
+        length += 1
+    return length
 
 
 if __name__ == '__main__':
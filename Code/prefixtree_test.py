@@ -1,6 +1,9 @@
 #!python3
 
-from prefixtree import PrefixTree, PrefixTreeNode
+from prefixtree import PrefixTree, PrefixTreeNode, RadixTree
+import json
+import sys
+import threading
 import unittest
 
 
@@ -267,6 +270,389 @@ class PrefixTreeTest(unittest.TestCase):
             assert len(tree_strings) == len(input_strings)  # Check length only
             self.assertCountEqual(tree_strings, input_strings)  # Ignore order
 
+    def test_complete_with_prefix_not_in_tree(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        # Verify a prefix that only partially matches a path has no completions
+        assert tree.complete('AX') == []
+        assert tree.complete('ABCD') == []
+        assert tree.complete('XYZW') == []
+
+    def test_complete_top_k_by_weight(self):
+        tree = PrefixTree()
+        weights = {'car': 5, 'cat': 9, 'cart': 7, 'care': 7, 'dog': 10, 'c': 1}
+        for string, weight in weights.items():
+            tree.insert(string, weight)
+        assert tree.root.max_weight == 10
+        assert tree.root.get_child('c').max_weight == 9
+        # Verify the best k strings come back by weight, ties in order
+        assert tree.complete('c', k=1) == ['cat']
+        assert tree.complete('c', k=3) == ['cat', 'care', 'cart']
+        assert tree.complete('car', k=10) == ['care', 'cart', 'car']
+        assert tree.complete('', k=2) == ['dog', 'cat']
+        assert tree.complete('x', k=2) == []
+        assert tree.complete('c', k=0) == []
+
+    def test_complete_top_k_after_reinsert_and_delete(self):
+        tree = PrefixTree()
+        tree.insert('car', 5)
+        tree.insert('cat', 9)
+        tree.insert('cart', 7)
+        # Verify inserting a string again replaces its weight
+        tree.insert('cat', 1)
+        assert tree.size == 3
+        assert tree.root.max_weight == 7
+        assert tree.complete('ca', k=2) == ['cart', 'car']
+        # Verify inserting a string again without a weight keeps its weight
+        tree.insert('cart')
+        tree.extend(['car', 'cab'])
+        assert tree.size == 4
+        assert tree.complete('ca', k=3) == ['cart', 'car', 'cat']
+        assert tree._find_node('cab')[0].weight == 0
+        tree.delete('cab')
+        # Verify deleting a string removes its weight from the subtree
+        tree.delete('cart')
+        assert tree.root.max_weight == 5
+        assert tree.complete('ca', k=2) == ['car', 'cat']
+        tree.delete('car')
+        tree.delete('cat')
+        assert tree.root.max_weight is None
+        assert tree.complete('', k=2) == []
+
+    def test_iter_complete_is_lazy(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        completions = tree.iter_complete('A')
+        assert next(completions) == 'A'
+        assert list(completions) == ['ABC', 'ABD']
+        assert list(tree.iter_complete('X')) == ['XYZ']
+        assert list(tree.iter_complete('AX')) == []
+        self.assertCountEqual(tree.iter_complete(''), tree.strings())
+
+    def test_complete_page_with_cursor(self):
+        strings = ['A', 'AB', 'ABC', 'ABD', 'AC', 'ACE', 'B']
+        tree = PrefixTree(strings)
+        page, cursor = tree.complete_page('A', 4)
+        assert page == ['A', 'AB', 'ABC', 'ABD']
+        assert isinstance(cursor, str)
+        page, cursor = tree.complete_page('A', 4, cursor)
+        assert page == ['AC', 'ACE']
+        assert cursor is None
+        # Verify a full last page does not hand out a cursor
+        page, cursor = tree.complete_page('AB', 3)
+        assert page == ['AB', 'ABC', 'ABD']
+        assert cursor is None
+        # Verify pages of one string at a time cover every completion
+        pages = []
+        page, cursor = tree.complete_page('', 1)
+        pages.extend(page)
+        while cursor is not None:
+            page, cursor = tree.complete_page('', 1, cursor)
+            pages.extend(page)
+        assert pages == tree.strings()
+        # Verify cursors for other prefixes are rejected
+        page, cursor = tree.complete_page('A', 1)
+        with self.assertRaises(ValueError):
+            tree.complete_page('B', 1, cursor)
+        with self.assertRaises(ValueError):
+            tree.complete_page('A', 1, 'not a cursor!')
+        # Verify a page must hold at least one string
+        for limit in [0, -1]:
+            with self.assertRaises(ValueError):
+                tree.complete_page('', limit)
+
+    def test_from_sorted(self):
+        strings = ['A', 'ABC', 'ABD', 'XYZ']
+        tree = PrefixTree.from_sorted(strings)
+        assert tree.size == 4
+        assert tree.strings() == strings
+        assert tree.root.num_children() == 2
+        node_B = tree.root.get_child('A').get_child('B')
+        assert node_B.is_terminal() is False
+        assert node_B.num_children() == 2
+        # Verify the tree can still be changed after a bulk load
+        tree.insert('AB')
+        tree.delete('ABC')
+        assert tree.strings() == ['A', 'AB', 'ABD', 'XYZ']
+        assert tree.complete('A', k=1) == ['A']
+
+    def test_from_sorted_with_repeats_and_unsorted_strings(self):
+        tree = PrefixTree.from_sorted(['', 'A', 'A', 'AB', 'AB'])
+        assert tree.size == 3
+        assert tree.contains('') is True
+        assert tree.strings() == ['', 'A', 'AB']
+        with self.assertRaises(ValueError):
+            PrefixTree.from_sorted(['AB', 'A'])
+        # Verify unsorted strings given to the initializer are sorted first
+        tree = PrefixTree(['XYZ', 'ABD', 'A', 'ABC', 'A'])
+        assert tree.size == 4
+        assert tree.strings() == ['A', 'ABC', 'ABD', 'XYZ']
+
+    def test_from_parallel(self):
+        strings = ['XYZ', 'ABD', 'A', 'ABC', 'A', 'AC', 'B', '', 'XY']
+        expected = sorted(set(strings))
+        for processes in [1, 2]:
+            for prefix_length in [1, 2]:
+                tree = PrefixTree.from_parallel(strings, processes,
+                                                prefix_length)
+                assert tree.size == len(expected)
+                assert tree.strings() == expected
+                assert tree.root.num_children() == 3
+                assert tree.root.get_child('A').num_children() == 2
+                assert tree.complete('A', k=2) == ['A', 'ABC']
+        assert PrefixTree.from_parallel([]).is_empty() is True
+
+    def test_from_parallel_matches_sequential_build(self):
+        letters = 'abcdefghij'
+        strings = [first + second + third + fourth for first in 'AB'
+                   for second in letters for third in letters
+                   for fourth in ['', *letters]]
+        tree = PrefixTree.from_parallel(strings, processes=2)
+        # Verify every node matches the node of a tree built in one process
+        expected = PrefixTree(strings)
+        pairs = [(tree.root, expected.root)]
+        while len(pairs) > 0:
+            node, expected_node = pairs.pop()
+            assert type(node) is PrefixTreeNode
+            for name in PrefixTreeNode.__slots__:
+                if name != 'children':
+                    assert (getattr(node, name) ==
+                            getattr(expected_node, name)), name
+            assert list(node.children) == list(expected_node.children)
+            pairs.extend(zip(node.children.values(),
+                             expected_node.children.values()))
+        # Verify strings are inserted and deleted below adopted nodes
+        tree.insert('Bjjz', 5)
+        tree.delete('Aaaa')
+        assert tree.size == len(strings)
+        assert tree.complete('Bjj', k=1) == ['Bjjz']
+        assert tree.complete('Aaa')[:2] == ['Aaa', 'Aaab']
+
+    def test_from_parallel_concurrent_readers(self):
+        letters = 'abcdefghij'
+        strings = [first + second + third + fourth for first in 'AB'
+                   for second in letters for third in letters
+                   for fourth in ['', *letters]]
+        tree = PrefixTree.from_parallel(strings, processes=2)
+        prefixes = ['A', 'Aa', 'Ajj', 'B', 'Bc', 'Bjjj', '']
+        expected = {prefix: sorted(string for string in strings
+                                   if string.startswith(prefix))
+                    for prefix in prefixes}
+        errors = []
+
+        def read():
+            try:
+                for prefix in prefixes * 3:
+                    assert tree.complete(prefix) == expected[prefix], prefix
+            except Exception as error:
+                errors.append(error)
+        # Verify readers that switch threads often never see a partial node
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=read) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        assert errors == []
+
+    def test_strings_in_lexicographic_order(self):
+        tree = PrefixTree()
+        for string in ['XYZ', 'ABD', 'A', 'ABC', 'B', 'AA']:
+            tree.insert(string)
+        assert tree.strings() == ['A', 'AA', 'ABC', 'ABD', 'B', 'XYZ']
+        assert tree.complete('A') == ['A', 'AA', 'ABC', 'ABD']
+        assert list(tree.root.children) == ['A', 'B', 'X']
+
+    def test_strings_between_successor_and_predecessor(self):
+        tree = PrefixTree(['A', 'AA', 'ABC', 'ABD', 'B', 'XYZ'])
+        assert tree.strings_between('AA', 'ABD') == ['AA', 'ABC']
+        assert tree.strings_between('AAA', 'C') == ['ABC', 'ABD', 'B']
+        assert tree.strings_between('', 'AB') == ['A', 'AA']
+        assert tree.strings_between('B', 'B') == []
+        assert tree.strings_between('Y', 'Z') == []
+        assert tree.successor('A') == 'AA'
+        assert tree.successor('AB') == 'ABC'
+        assert tree.successor('ABE') == 'B'
+        assert tree.successor('') == 'A'
+        assert tree.successor('XYZ') is None
+        assert tree.predecessor('AA') == 'A'
+        assert tree.predecessor('ABCD') == 'ABC'
+        assert tree.predecessor('AZ') == 'ABD'
+        assert tree.predecessor('Y') == 'XYZ'
+        assert tree.predecessor('A') is None
+        # Verify a cursor still resumes after its string is deleted
+        page, cursor = tree.complete_page('A', 2)
+        assert page == ['A', 'AA']
+        tree.delete('AA')
+        page, cursor = tree.complete_page('A', 2, cursor)
+        assert page == ['ABC', 'ABD']
+
+    def test_prefixes_of_and_longest_prefix_of(self):
+        tree = PrefixTree(['A', 'AB', 'ABCD', 'B', 'XYZ'])
+        assert tree.prefixes_of('ABCDE') == ['A', 'AB', 'ABCD']
+        assert tree.prefixes_of('ABC') == ['A', 'AB']
+        assert tree.prefixes_of('XY') == []
+        assert tree.prefixes_of('') == []
+        assert tree.longest_prefix_of('ABCDE') == 'ABCD'
+        assert tree.longest_prefix_of('ABX') == 'AB'
+        assert tree.longest_prefix_of('C') is None
+        tree.insert('')
+        assert tree.prefixes_of('BA') == ['', 'B']
+        assert tree.longest_prefix_of('C') == ''
+
+    def test_tokenize(self):
+        tree = PrefixTree(['the', 'them', 'theme', 'me', 'a', 'park'])
+        text = 'themeparkthemaths'
+        tokens = ['theme', 'park', 'them', 'a', 't', 'h', 's']
+        assert list(tree.tokenize(text)) == tokens
+        assert list(tree.tokenize('')) == []
+        # Verify tokens may span the boundaries between chunks
+        chunks = ['th', 'em', 'epar', 'kthe', '', 'maths']
+        assert list(tree.tokenize(iter(chunks))) == tokens
+
+    def test_extend(self):
+        tree = PrefixTree(cache_size=4)
+        assert tree.complete('A') == []
+        # Verify sorted strings are grafted until one is out of order
+        tree.extend(iter(['A', 'ABC', 'ABC', 'ABD', 'AB', 'XYZ', 'A']))
+        assert tree.size == 5
+        assert sorted(tree.strings()) == ['A', 'AB', 'ABC', 'ABD', 'XYZ']
+        assert tree.complete('A', k=1) == ['A']
+        assert sorted(tree.complete('A')) == ['A', 'AB', 'ABC', 'ABD']
+        assert tree.count_prefix('AB') == 3
+        tree.extend(['ABE', 'B'])
+        assert tree.size == 7
+        assert tree.rank('B') == 5
+
+    def test_count_prefix_rank_and_select(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ', 'AC', '']
+        tree = PrefixTree(strings)
+        assert tree.root.count == 6
+        assert tree.count_prefix('') == 6
+        assert tree.count_prefix('A') == 4
+        assert tree.count_prefix('AB') == 2
+        assert tree.count_prefix('ABCD') == 0
+        assert tree.count_prefix('B') == 0
+        for index, string in enumerate(sorted(strings)):
+            assert tree.select(index) == string
+            assert tree.rank(string) == index
+        assert tree.rank('AA') == 2
+        assert tree.rank('ABCD') == 3
+        assert tree.rank('B') == 5
+        assert tree.rank('ZZ') == 6
+        with self.assertRaises(IndexError):
+            tree.select(6)
+        # Verify counts are kept up to date by insert and delete
+        tree.insert('AB')
+        tree.insert('AB')
+        tree.delete('ABC')
+        assert tree.count_prefix('A') == 4
+        assert tree.count_prefix('AB') == 2
+        assert tree.rank('AC') == 4
+        assert tree.select(4) == 'AC'
+
+    def test_fuzzy_contains(self):
+        tree = PrefixTree(['cat', 'cart', 'dog', 'doge'])
+        assert tree.fuzzy_contains('cat', 0) is True
+        assert tree.fuzzy_contains('cta', 0) is False
+        # Verify substitution, insertion and deletion each count as one edit
+        assert tree.fuzzy_contains('cot', 1) is True
+        assert tree.fuzzy_contains('dg', 1) is True
+        assert tree.fuzzy_contains('dogge', 1) is True
+        assert tree.fuzzy_contains('cta', 1) is False
+        assert tree.fuzzy_contains('cta', 2) is True
+        assert tree.fuzzy_contains('', 2) is False
+        assert tree.fuzzy_contains('', 3) is True
+
+    def test_fuzzy_complete(self):
+        tree = PrefixTree(['cat', 'cart', 'car', 'dog', 'doge', 'cut'])
+        assert tree.fuzzy_complete('car', 0) == tree.complete('car')
+        self.assertCountEqual(tree.fuzzy_complete('cer', 1),
+                              ['car', 'cart'])
+        self.assertCountEqual(tree.fuzzy_complete('ca', 1),
+                              ['cat', 'cart', 'car', 'cut'])
+        self.assertCountEqual(tree.fuzzy_complete('dgo', 1), ['dog', 'doge'])
+        assert tree.fuzzy_complete('xyz', 1) == []
+        self.assertCountEqual(tree.fuzzy_complete('xy', 2), tree.strings())
+
+    def test_match(self):
+        tree = PrefixTree(['cat', 'cart', 'car', 'cot', 'cut', 'dog', 'doge',
+                           'a*b', ''])
+        assert tree.match('cat') == ['cat']
+        assert tree.match('c?t') == ['cat', 'cot', 'cut']
+        assert tree.match('ca*') == ['car', 'cart', 'cat']
+        assert tree.match('*t') == ['cart', 'cat', 'cot', 'cut']
+        assert tree.match('c[ao]t') == ['cat', 'cot']
+        assert tree.match('c[!ao]t') == ['cut']
+        assert tree.match('c[a-o]?') == ['car', 'cat', 'cot']
+        assert tree.match('d*g*') == ['dog', 'doge']
+        assert tree.match('???') == ['a*b', 'car', 'cat', 'cot', 'cut',
+                                     'dog']
+        # Verify a bracketed '*' matches only itself
+        assert tree.match('a[*]b') == ['a*b']
+        assert tree.match('') == ['']
+        assert tree.match('*') == tree.strings()
+        assert tree.match('x*') == []
+
+    def test_complete_many(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ', 'XY'])
+        prefixes = ['AB', 'A', 'X', 'XYZ', 'B', 'AB', 'ABE', '']
+        completions = tree.complete_many(prefixes)
+        self.assertCountEqual(completions.keys(), set(prefixes))
+        for prefix in prefixes:
+            assert completions[prefix] == tree.complete(prefix)
+        # Verify nested prefixes get their own lists
+        completions['A'].append('AZ')
+        assert completions['AB'] == ['ABC', 'ABD']
+        assert tree.complete_many([]) == {}
+
+    def test_complete_with_cache(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'], cache_size=3)
+        assert tree.complete('AB') == ['ABC', 'ABD']
+        assert tree.complete('AB') == ['ABC', 'ABD']
+        assert tree.complete('X') == ['XYZ']
+        assert tree.cache.stats()['hits'] == 1
+        assert tree.cache.stats()['misses'] == 2
+        # Verify changing a returned list does not change the cached results
+        tree.complete('AB').append('ABE')
+        assert tree.complete('AB') == ['ABC', 'ABD']
+        # Verify inserting a string only invalidates results for its prefixes
+        tree.insert('ABE')
+        assert tree.cache.get('X') == ('XYZ',)
+        assert tree.cache.get('AB') is None
+        assert tree.complete('AB') == ['ABC', 'ABD', 'ABE']
+        # Verify deleting a string invalidates results for its prefixes
+        tree.delete('ABC')
+        assert tree.complete('AB') == ['ABD', 'ABE']
+        # Verify top-k results are cached apart from full results
+        tree.insert('ABF', 5)
+        assert tree.complete('AB', k=1) == ['ABF']
+        assert tree.complete('AB') == ['ABD', 'ABE', 'ABF']
+        tree.insert('ABF', 0)
+        assert tree.complete('AB', k=1) == ['ABD']
+
+    def test_stats(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        stats = tree.stats()
+        assert stats['num_nodes'] == 8
+        assert stats['num_terminals'] == 4
+        assert stats['height'] == 3
+        assert stats['depth_histogram'] == [1, 2, 2, 3]
+        assert stats['terminal_depth_histogram'] == [0, 1, 0, 3]
+        assert stats['branching_histogram'] == [3, 3, 2]
+        # Nodes X and Y would be merged into Z by path compression, but not
+        # A, which terminates a string, nor B, which has two children
+        assert stats['compressible_nodes'] == 2
+        assert stats['single_child_chains'] == 1
+        assert stats['chain_length_histogram'] == [0, 0, 1]
+        assert stats['memory_bytes'] > 0
+        assert stats['bytes_per_node'] == stats['memory_bytes'] / 8
+        assert stats['bytes_per_word'] == stats['memory_bytes'] / 4
+        assert json.loads(tree.stats_json()) == stats
+        assert PrefixTree().stats()['num_nodes'] == 1
+
     def test_delete_key_shares_prefix_with_other_strings(self):
         """
         A string is deleted from the trie without removing strings that contain
@@ -285,6 +671,39 @@ class PrefixTreeTest(unittest.TestCase):
         # test that the deleted string cannot be found
         assert tree.contains('A') is False
 
+    def test_delete_prunes_nodes(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        # Verify deleting a string with its own branch removes the branch
+        tree.delete('XYZ')
+        assert tree.root.has_child('X') is False
+        # Verify deleting a string stops pruning at a shared node
+        tree.delete('ABD')
+        node_B = tree.root.get_child('A').get_child('B')
+        assert node_B.num_children() == 1
+        assert node_B.has_child('D') is False
+        # Verify deleting a prefix of another string prunes nothing
+        tree.delete('A')
+        assert tree.root.get_child('A').num_children() == 1
+        tree.delete('ABC')
+        assert tree.root.num_children() == 0
+        assert tree.is_empty() is True
+        assert tree.strings() == []
+
+    def test_compact(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A'])
+        # Nothing is left to prune after deletes, but dictionaries are rebuilt
+        tree.delete('ABD')
+        node_B = tree.root.get_child('A').get_child('B')
+        assert tree.compact() == 0
+        assert tree.strings() == ['A', 'ABC']
+        # Verify nodes that do not lead to a stored string are pruned
+        node_B.get_child('C').add_child('E', PrefixTreeNode('E'))
+        node_B.add_child('F', PrefixTreeNode('F'))
+        assert tree.compact() == 2
+        assert node_B.num_children() == 1
+        assert node_B.get_child('C').num_children() == 0
+        assert tree.strings() == ['A', 'ABC']
+
     def test_delete_from_empty_trie(self):
         """
         If string cannot be found, a ValueError is raised.
@@ -296,5 +715,204 @@ class PrefixTreeTest(unittest.TestCase):
             tree.delete('CS Rocks!')
 
 
+class RadixTreeTest(unittest.TestCase):
+
+    def test_insert_splits_and_compresses_labels(self):
+        tree = RadixTree()
+        tree.insert('ABC')
+        # Verify the whole string is stored on a single node below the root
+        assert tree.root.num_children() == 1
+        node_ABC = tree.root.get_child('A')
+        assert node_ABC.character == 'ABC'
+        assert node_ABC.is_terminal() is True
+        # Insert string that diverges partway along the label 'ABC'
+        tree.insert('ABD')
+        node_AB = tree.root.get_child('A')
+        assert node_AB.character == 'AB'
+        assert node_AB.is_terminal() is False
+        assert node_AB.num_children() == 2
+        assert node_AB.get_child('C') is node_ABC
+        assert node_ABC.character == 'C'
+        assert node_AB.get_child('D').character == 'D'
+        # Insert string that ends partway along the label 'AB'
+        tree.insert('A')
+        node_A = tree.root.get_child('A')
+        assert node_A.character == 'A'
+        assert node_A.is_terminal() is True
+        assert node_A.get_child('B') is node_AB
+        assert node_AB.character == 'B'
+        assert tree.size == 3
+
+    def test_contains_and_complete(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ']
+        tree = RadixTree(strings)
+        assert tree.size == 4
+        for string in strings:
+            assert tree.contains(string) is True
+        for string in ['AB', 'X', 'XY', 'B', 'ABCD', '']:
+            assert tree.contains(string) is False
+        assert tree.complete('A') == ['A', 'ABC', 'ABD']
+        assert tree.complete('AB') == ['ABC', 'ABD']
+        assert tree.complete('X') == ['XYZ']
+        assert tree.complete('XY') == ['XYZ']
+        assert tree.complete('XYZ') == ['XYZ']
+        assert tree.complete('XZ') == []
+        assert tree.complete('XYZW') == []
+        assert tree.complete('B') == []
+        self.assertCountEqual(tree.complete(''), strings)
+        self.assertCountEqual(tree.strings(), strings)
+
+    def test_delete_merges_nodes(self):
+        tree = RadixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        tree.delete('ABD')
+        # Node 'B' is left with one child so it is merged into 'BC'
+        node_A = tree.root.get_child('A')
+        assert node_A.num_children() == 1
+        assert node_A.get_child('B').character == 'BC'
+        tree.delete('A')
+        # Node 'A' is no longer terminal so it is merged into 'ABC'
+        assert tree.root.get_child('A').character == 'ABC'
+        assert tree.contains('ABC') is True
+        assert tree.contains('A') is False
+        assert tree.size == 2
+        self.assertCountEqual(tree.strings(), ['ABC', 'XYZ'])
+        with self.assertRaises(ValueError):
+            tree.delete('AB')
+
+    def test_complete_top_k_by_weight(self):
+        tree = RadixTree()
+        weights = {'romane': 3, 'romanus': 8, 'romulus': 2, 'rubens': 6,
+                   'ruber': 8, 'rubicon': 1}
+        for string, weight in weights.items():
+            tree.insert(string, weight)
+        assert tree.complete('r', k=3) == ['romanus', 'ruber', 'rubens']
+        assert tree.complete('rom', k=2) == ['romanus', 'romane']
+        assert tree.complete('rube', k=5) == ['ruber', 'rubens']
+        tree.delete('romanus')
+        tree.insert('rubicon', 9)
+        assert tree.complete('r', k=2) == ['rubicon', 'ruber']
+        assert tree.complete('rom', k=2) == ['romane', 'romulus']
+
+    def test_insert_keeps_weight_unless_given(self):
+        tree = RadixTree()
+        tree.insert('romane', 3)
+        tree.insert('romanus', 8)
+        tree.insert('romanus')
+        tree.insert('roman')
+        assert tree.complete('rom', k=3) == ['romanus', 'romane', 'roman']
+        tree.insert('romanus', 1)
+        assert tree.complete('rom', k=1) == ['romane']
+
+    def test_complete_page_with_cursor(self):
+        tree = RadixTree(['romane', 'romanus', 'romulus', 'rubens', 'ruber'])
+        page, cursor = tree.complete_page('ro', 2)
+        assert page == ['romane', 'romanus']
+        page, cursor = tree.complete_page('ro', 2, cursor)
+        assert page == ['romulus']
+        assert cursor is None
+        assert list(tree.iter_complete('rub')) == ['rubens', 'ruber']
+
+    def test_from_sorted(self):
+        tree = RadixTree.from_sorted(['romane', 'romanus', 'romulus'])
+        assert isinstance(tree, RadixTree)
+        assert tree.root.get_child('r').character == 'rom'
+        assert tree.strings() == ['romane', 'romanus', 'romulus']
+
+    def test_from_parallel(self):
+        strings = ['romulus', 'rubens', 'romane', 'romanus', 'ruber']
+        tree = RadixTree.from_parallel(strings, processes=2, prefix_length=3)
+        assert isinstance(tree, RadixTree)
+        assert tree.root.get_child('r').character == 'r'
+        assert tree.strings() == sorted(strings)
+
+    def test_strings_between_successor_and_predecessor(self):
+        tree = RadixTree(['rubens', 'romulus', 'romane', 'ruber', 'romanus'])
+        assert tree.strings() == ['romane', 'romanus', 'romulus', 'rubens',
+                                  'ruber']
+        assert tree.strings_between('roman', 'romz') == ['romane', 'romanus',
+                                                         'romulus']
+        assert tree.successor('romanf') == 'romanus'
+        assert tree.successor('rom') == 'romane'
+        assert tree.predecessor('romanf') == 'romane'
+        assert tree.predecessor('ruby') == 'ruber'
+        assert tree.predecessor('rubb') == 'romulus'
+
+    def test_prefixes_of_and_tokenize(self):
+        tree = RadixTree(['rom', 'roman', 'romanus', 'rubens'])
+        assert tree.prefixes_of('romanusx') == ['rom', 'roman', 'romanus']
+        assert tree.longest_prefix_of('romanu') == 'roman'
+        assert tree.longest_prefix_of('rub') is None
+        assert list(tree.tokenize(['romanr', 'ube', 'nxrom'])) == [
+            'roman', 'r', 'u', 'b', 'e', 'n', 'x', 'rom']
+        assert list(tree.tokenize(['romanr', 'ubens'])) == [
+            'roman', 'rubens']
+
+    def test_count_prefix_rank_and_select(self):
+        strings = ['romane', 'romanus', 'romulus', 'rubens', 'ruber']
+        tree = RadixTree(strings)
+        assert tree.count_prefix('r') == 5
+        assert tree.count_prefix('ro') == 3
+        assert tree.count_prefix('roman') == 2
+        assert tree.count_prefix('romx') == 0
+        for index, string in enumerate(strings):
+            assert tree.select(index) == string
+            assert tree.rank(string) == index
+        assert tree.rank('ro') == 0
+        assert tree.rank('romb') == 2
+        assert tree.rank('rubicon') == 5
+        tree.insert('rom')
+        tree.delete('romulus')
+        assert tree.count_prefix('rom') == 3
+        assert tree.select(0) == 'rom'
+        assert tree.rank('rubens') == 3
+
+    def test_fuzzy_contains_and_complete(self):
+        tree = RadixTree(['romane', 'romanus', 'romulus', 'rubens'])
+        assert tree.fuzzy_contains('romanes', 1) is True
+        assert tree.fuzzy_contains('rumulus', 1) is True
+        assert tree.fuzzy_contains('rumulas', 1) is False
+        self.assertCountEqual(tree.fuzzy_complete('rumu', 1), ['romulus'])
+        self.assertCountEqual(tree.fuzzy_complete('roma', 1),
+                              ['romane', 'romanus', 'romulus'])
+
+    def test_match(self):
+        tree = RadixTree(['romane', 'romanus', 'romulus', 'rubens', 'ruber'])
+        assert tree.match('rom*us') == ['romanus', 'romulus']
+        assert tree.match('rom?nus') == ['romanus']
+        assert tree.match('ru[b]e[nr]*') == ['rubens', 'ruber']
+        assert tree.match('*e*') == ['romane', 'rubens', 'ruber']
+        assert tree.match('roma') == []
+
+    def test_complete_many(self):
+        tree = RadixTree(['romane', 'romanus', 'romulus', 'rubens', 'ruber'])
+        prefixes = ['r', 'ro', 'rom', 'roma', 'romu', 'rub', 'rx', 'rubens']
+        completions = tree.complete_many(prefixes)
+        for prefix in prefixes:
+            assert completions[prefix] == tree.complete(prefix)
+
+    def test_stats_predict_path_compression(self):
+        strings = ['romane', 'romanus', 'romulus', 'rubens', 'ruber']
+        tree_stats = PrefixTree(strings).stats()
+        radix_stats = RadixTree(strings).stats()
+        assert (tree_stats['num_nodes'] - tree_stats['compressible_nodes'] ==
+                radix_stats['num_nodes'])
+        assert radix_stats['compressible_nodes'] == 0
+        assert radix_stats['num_terminals'] == 5
+
+    def test_has_fewer_nodes_than_prefix_tree(self):
+        strings = ['romane', 'romanus', 'romulus', 'rubens', 'ruber',
+                   'rubicon', 'rubicundus']
+        radix_tree = RadixTree(strings)
+        prefix_tree = PrefixTree(strings)
+
+        def count_nodes(node):
+            return 1 + sum(count_nodes(child)
+                           for child in node.children.values())
+
+        assert count_nodes(radix_tree.root) == 14
+        assert count_nodes(prefix_tree.root) == 28
+        self.assertCountEqual(radix_tree.strings(), prefix_tree.strings())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -6,12 +6,16 @@ class PrefixTreeNode:
        character from a string and a structure of children nodes below it,
        which associates the next character in a string to the next node along
        its path from the tree's root node to a terminal node that marks the end
-       of the string.
+       of the string. Children are kept in sorted order of their characters,
+       so strings are retrieved in lexicographic order.
 
     """
     # Choose an appropriate type of data structure to store children nodes in
     # Hint: Choosing list or dict affects implementation of all child methods
     CHILDREN_TYPE = dict  # or list
+    # Store attributes in fixed slots rather than a per-node __dict__
+    __slots__ = ('character', 'children', 'terminal', 'weight', 'max_weight',
+                 'count')
 
     def __init__(self, character=None):
         """Initialize this prefix tree node with the given character value, an
@@ -22,6 +26,12 @@ class PrefixTreeNode:
         self.children = PrefixTreeNode.CHILDREN_TYPE()
         # Marks if this node terminates a string in the prefix tree
         self.terminal = False
+        # Weight of the string this node terminates, if it is terminal
+        self.weight = None
+        # Highest weight of any string terminated in this node's subtree
+        self.max_weight = None
+        # Number of strings terminated in this node's subtree, including here
+        self.count = 0
 
     def is_terminal(self):
         """Return True if this prefix tree node terminates a string.
@@ -63,15 +73,37 @@ class PrefixTreeNode:
     def add_child(self, character, child_node):
         """Add the given character and child node as a child of this node, or
            raise ValueError if given character is amongst this node's children.
+           Children stay in sorted order of their characters.
 
-           Runtime Complexity: O(n)
+           Runtime Complexity:
+           O(1) if the character comes after all others, which is the case
+           when strings are inserted in sorted order, or O(n) otherwise, to
+           move the children that come after it back behind it.
 
         """
         if self.has_child(character) is False:
+            last = next(reversed(self.children), None)
             self.children[character] = child_node
+            if last is not None and character < last:
+                # move the children that come after it back behind it
+                for key in [key for key in self.children if key > character]:
+                    self.children[key] = self.children.pop(key)
         else:
             raise ValueError(f'Child exists for character {character!r}')
 
+    def copy(self):
+        """Return a copy of this prefix tree node with the same attributes and
+           its own structure of the same children nodes, which are shared.
+
+           Runtime Complexity: O(n)
+
+        """
+        node = PrefixTreeNode.__new__(PrefixTreeNode)
+        for name in PrefixTreeNode.__slots__:
+            setattr(node, name, getattr(self, name))
+        node.children = PrefixTreeNode.CHILDREN_TYPE(self.children)
+        return node
+
     def __repr__(self):
         """Return a code representation of this prefix tree node."""
         return f'PrefixTreeNode({self.character!r})'
@@ -49,3 +49,26 @@ class PrefixTreeNodeTest(unittest.TestCase):
         # Verify adding node 'C' as child to node 'A' again raises error
         with self.assertRaises(ValueError):
             node_A.add_child('C', node_C)
+
+    def test_children_stay_sorted(self):
+        node = PrefixTreeNode('')
+        for character in ['M', 'C', 'X', 'A', 'N']:
+            node.add_child(character, PrefixTreeNode(character))
+        assert list(node.children) == ['A', 'C', 'M', 'N', 'X']
+        assert node.get_child('C').character == 'C'
+
+    def test_copy(self):
+        node_A = PrefixTreeNode('A')
+        node_B = PrefixTreeNode('B')
+        node_A.add_child('B', node_B)
+        node_A.terminal = True
+        node_A.weight = 3
+        copy = node_A.copy()
+        assert copy is not node_A
+        assert copy.character == 'A'
+        assert copy.terminal is True
+        assert copy.weight == 3
+        # Verify the copy shares children but not the structure holding them
+        assert copy.get_child('B') is node_B
+        copy.add_child('C', PrefixTreeNode('C'))
+        assert node_A.has_child('C') is False
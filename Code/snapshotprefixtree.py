@@ -0,0 +1,140 @@
+#!python3
+
+from prefixtree import PrefixTree
+import threading
+
+
+class SnapshotPrefixTree:
+    """SnapshotPrefixTree: A prefix tree that can be read by any number of
+       threads while another thread inserts or deletes strings, without
+       locking readers out.
+
+       Every version of the tree is a PrefixTree (or RadixTree) that is never
+       changed once it is published. A writer copies only the nodes on the
+       path of the string it inserts or deletes, shares every other node with
+       the current version, changes the copies and then publishes the new
+       version by replacing a single reference. A read, such as a completion
+       that is still being iterated, keeps the version that was current when
+       it started. Writers are serialized with a lock.
+
+    """
+
+    # Methods that only read the tree, which are answered by the current
+    # version
+    READERS = frozenset(['is_empty', 'contains', 'complete', 'complete_many',
+                         'complete_page', 'iter_complete', 'fuzzy_contains',
+                         'fuzzy_complete', 'match', 'count_prefix', 'rank',
+                         'select', 'strings_between', 'successor',
+                         'predecessor', 'prefixes_of', 'longest_prefix_of',
+                         'tokenize', 'strings', 'stats', 'stats_json',
+                         'save'])
+
+    def __init__(self, strings=None, tree_class=PrefixTree):
+        """Initialize this prefix tree as a tree of the given class that
+        stores the given strings, if any."""
+        # Current version of the tree, which is never changed
+        self.tree = tree_class(strings)
+        # Lock held by the thread that is making the next version
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        """Return a string representation of this prefix tree."""
+        return f'SnapshotPrefixTree({self.strings()!r})'
+
+    def __getattr__(self, name):
+        """Return the given method of the current version, if it only reads
+        the tree, or raise AttributeError."""
+        if name in SnapshotPrefixTree.READERS:
+            return getattr(self.tree, name)
+        raise AttributeError(f'{type(self).__name__!r} object has no '
+                             f'attribute {name!r}')
+
+    @property
+    def size(self):
+        """Return the number of strings stored in the current version."""
+        return self.tree.size
+
+    def snapshot(self):
+        """Return the current version of this prefix tree, which is a
+        PrefixTree (or RadixTree) that later writes never change."""
+        return self.tree
+
+    def insert(self, string, weight=None):
+        """Insert the given string into a new version of this prefix tree with
+           the given weight, or keeping its weight if it is already stored (see
+           PrefixTree.insert), and publish it.
+
+           Runtime Complexity:
+           O(m * b), where m is the length of the string and b is the largest
+           number of children of a node along its path, which are copied.
+
+        """
+        with self.lock:
+            tree = self._next_version(string)
+            tree.insert(string, weight)
+            self.tree = tree
+
+    def delete(self, key):
+        """Delete the given key from a new version of this prefix tree and
+           publish it, or raise ValueError if the key is not stored, leaving
+           the current version published.
+
+           Runtime Complexity:
+           O(m * b), where m is the length of the key and b is the largest
+           number of children of a node along its path, which are copied.
+
+        """
+        with self.lock:
+            tree = self._next_version(key)
+            tree.delete(key)
+            self.tree = tree
+
+    def _next_version(self, string):
+        """Return an unpublished copy of the current version in which the
+           nodes along the path of the given string, and the node whose label
+           it diverges partway along (in a radix tree), are copies that can be
+           changed, and all other nodes are shared.
+
+           Runtime Complexity:
+           O(m * b) for a string of length m, copying the children of at most
+           m + 1 nodes with at most b children each.
+
+        """
+        current = self.tree
+        tree = type(current)()
+        tree.size = current.size
+        tree.root = node = current.root.copy()
+        index = 0
+        while index < len(string):
+            child = node.children.get(string[index])
+            if child is None:
+                break
+            child = child.copy()
+            node.children[string[index]] = child
+            if string.startswith(child.character, index) is False:
+                break
+            node = child
+            index += len(child.character)
+        return tree
+
+
+def main():
+    """Compare the time to insert strings into a PrefixTree and into a
+    SnapshotPrefixTree of the words in the given file."""
+    import sys
+    import time
+    from autocomplete import get_lines
+    words = get_lines(sys.argv[1]) if len(sys.argv) > 1 else get_lines()
+    base, added = words[::2], words[1::2]
+
+    for tree in [PrefixTree(base), SnapshotPrefixTree(base)]:
+        start_time = time.time()
+        for word in added:
+            tree.insert(word)
+        insert_time = time.time() - start_time
+        print(f'{type(tree).__name__}: {len(added)} inserts in '
+              f'{insert_time:.6f} sec')
+
+
+if __name__ == '__main__':
+    main()
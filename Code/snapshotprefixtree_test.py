@@ -0,0 +1,97 @@
+#!python3
+
+from snapshotprefixtree import SnapshotPrefixTree
+from prefixtree import RadixTree
+import threading
+import unittest
+
+
+class SnapshotPrefixTreeTest(unittest.TestCase):
+
+    def test_insert_and_delete_publish_new_versions(self):
+        tree = SnapshotPrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        assert tree.size == 4
+        assert tree.contains('ABC') is True
+        snapshot = tree.snapshot()
+        tree.insert('ABE', weight=5)
+        tree.delete('XYZ')
+        assert tree.size == 4
+        assert tree.strings() == ['A', 'ABC', 'ABD', 'ABE']
+        assert tree.complete('A', k=1) == ['ABE']
+        # Verify inserting a stored string without a weight keeps its weight
+        tree.insert('ABE')
+        assert tree.complete('A', k=1) == ['ABE']
+        # Verify the old version is unchanged
+        assert snapshot.size == 4
+        assert snapshot.strings() == ['A', 'ABC', 'ABD', 'XYZ']
+        assert snapshot.contains('ABE') is False
+        # Verify a failed delete publishes no new version
+        current = tree.snapshot()
+        with self.assertRaises(ValueError):
+            tree.delete('AB')
+        assert tree.snapshot() is current
+        # Verify only readers are answered by the current version
+        with self.assertRaises(AttributeError):
+            tree.compact()
+
+    def test_insert_copies_only_the_path(self):
+        tree = SnapshotPrefixTree(['ABC', 'ABD', 'XYZ'])
+        old_root = tree.snapshot().root
+        tree.insert('ABE')
+        new_root = tree.snapshot().root
+        assert new_root is not old_root
+        assert new_root.get_child('A') is not old_root.get_child('A')
+        assert new_root.get_child('X') is old_root.get_child('X')
+        node_B = new_root.get_child('A').get_child('B')
+        assert node_B.get_child('C') is \
+            old_root.get_child('A').get_child('B').get_child('C')
+        assert old_root.get_child('A').get_child('B').num_children() == 2
+
+    def test_iteration_continues_over_old_version(self):
+        tree = SnapshotPrefixTree(['A' + str(number) for number in range(10)])
+        completions = tree.iter_complete('A')
+        assert next(completions) == 'A0'
+        for number in range(10, 100):
+            tree.insert('A' + str(number))
+        tree.delete('A5')
+        assert len(list(completions)) == 9
+        assert tree.size == 99
+
+    def test_radix_tree_versions(self):
+        tree = SnapshotPrefixTree(['romane', 'romanus', 'romulus'],
+                                  tree_class=RadixTree)
+        snapshot = tree.snapshot()
+        tree.insert('roma')
+        tree.delete('romulus')
+        assert isinstance(tree.snapshot(), RadixTree)
+        assert tree.strings() == ['roma', 'romane', 'romanus']
+        assert tree.snapshot().root.get_child('r').character == 'roma'
+        assert snapshot.strings() == ['romane', 'romanus', 'romulus']
+        assert snapshot.root.get_child('r').character == 'rom'
+
+    def test_concurrent_readers_and_writer(self):
+        words = ['W' + str(number) for number in range(2000)]
+        tree = SnapshotPrefixTree(words[:1000])
+        errors = []
+
+        def read():
+            try:
+                for _ in range(20):
+                    size = len(tree.complete('W'))
+                    assert 1000 <= size <= 2000
+            except Exception as error:
+                errors.append(error)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for word in words[1000:]:
+            tree.insert(word)
+        for reader in readers:
+            reader.join()
+        assert errors == []
+        assert sorted(tree.strings()) == sorted(words)
+
+
+if __name__ == '__main__':
+    unittest.main()
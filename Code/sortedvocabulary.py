@@ -0,0 +1,148 @@
+#!python3
+
+from array import array
+import sys
+
+
+class SortedVocabulary:
+    """SortedVocabulary: A read-only set of strings kept in sorted order in
+       one contiguous string, with an array of the offsets at which each
+       string starts, so there is no object for each string, only a few
+       bytes of offset.
+
+       All strings that start with a prefix are a contiguous run of the
+       sorted strings, found with two binary searches: one for the prefix
+       itself and one for the smallest string greater than all strings that
+       start with it.
+
+    """
+
+    def __init__(self, strings=None):
+        """Initialize this vocabulary with the given strings, if any, sorted
+        and without repeats."""
+        words = sorted(set(strings)) if strings is not None else []
+        # All strings joined in sorted order
+        self.blob = ''.join(words)
+        # Offset of the start of each string, and of the end of the last one
+        self.offsets = array('L', [0])
+        offset = 0
+        for word in words:
+            offset += len(word)
+            self.offsets.append(offset)
+        # Count the number of strings in the vocabulary
+        self.size = len(words)
+
+    def __repr__(self):
+        """Return a string representation of this vocabulary."""
+        return f'SortedVocabulary({self.strings()!r})'
+
+    def is_empty(self):
+        """Return True if this vocabulary is empty (contains no strings)."""
+        return (self.size == 0)
+
+    def _word(self, index):
+        """Return the string at the given index in sorted order."""
+        return self.blob[self.offsets[index]:self.offsets[index + 1]]
+
+    def _lower_bound(self, string, low=0):
+        """Return the index of the first string in sorted order that is not
+           less than the given string, searching from the given index.
+
+           Runtime Complexity:
+           O(m * log(n)) for n strings, comparing at most m characters at each
+           step of the binary search.
+
+        """
+        high = self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self._word(middle) < string:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _range(self, prefix):
+        """Return a pair of the index of the first string that starts with the
+        given prefix and the index just past the last one."""
+        low = self._lower_bound(prefix)
+        successor = _prefix_successor(prefix)
+        if successor is None:
+            return low, self.size
+        return low, self._lower_bound(successor, low)
+
+    def contains(self, string):
+        """Return True if this vocabulary contains the given string.
+
+           Runtime Complexity: O(m * log(n)) for a string of length m.
+
+        """
+        index = self._lower_bound(string)
+        return index < self.size and self._word(index) == string
+
+    def complete(self, prefix):
+        """Return a list of all strings in this vocabulary that start with
+           the given prefix string, in sorted order.
+
+           Runtime Complexity:
+           O(m * log(n) + k), where m is the length of the prefix and k is the
+           total length of the completions.
+
+        """
+        low, high = self._range(prefix)
+        return [self._word(index) for index in range(low, high)]
+
+    def count(self, prefix):
+        """Return the number of strings in this vocabulary that start with the
+        given prefix string, in O(m * log(n)) time."""
+        low, high = self._range(prefix)
+        return high - low
+
+    def complete_many(self, prefixes):
+        """Return a dictionary that maps each of the given prefix strings to
+        the list of strings in this vocabulary that start with it."""
+        return {prefix: self.complete(prefix) for prefix in prefixes}
+
+    def strings(self):
+        """Return a list of all strings in this vocabulary, in sorted
+        order."""
+        return [self._word(index) for index in range(self.size)]
+
+    def memory_size(self):
+        """Return the number of bytes used by this vocabulary's string and
+        array of offsets."""
+        return sys.getsizeof(self.blob) + sys.getsizeof(self.offsets)
+
+
+def _prefix_successor(prefix):
+    """Return the smallest string that is greater than every string that
+    starts with the given prefix, or None if there is no such string (when
+    the prefix is empty or made only of the largest code point)."""
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if len(prefix) == 0:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def main():
+    """Compare bytes per word of a PrefixTree and a SortedVocabulary."""
+    from arrayprefixtree import node_memory_size
+    from autocomplete import get_lines
+    from prefixtree import PrefixTree
+    words = get_lines(sys.argv[1]) if len(sys.argv) > 1 else get_lines()
+
+    tree = PrefixTree(words)
+    tree_bytes = node_memory_size(tree.root)
+    vocabulary = SortedVocabulary(words)
+    vocabulary_bytes = vocabulary.memory_size()
+    list_bytes = sys.getsizeof(words) + sum(map(sys.getsizeof, words))
+
+    print(f'Vocabulary size: {vocabulary.size} words')
+    print(f'List of strings:  {list_bytes / len(words):8.1f} bytes per word')
+    print(f'PrefixTree:       {tree_bytes / tree.size:8.1f} bytes per word')
+    print(f'SortedVocabulary: {vocabulary_bytes / vocabulary.size:8.1f} '
+          f'bytes per word')
+
+
+if __name__ == '__main__':
+    main()
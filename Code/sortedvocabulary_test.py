@@ -0,0 +1,59 @@
+#!python3
+
+from sortedvocabulary import SortedVocabulary
+from prefixtree import PrefixTree
+import sys
+import unittest
+
+
+class SortedVocabularyTest(unittest.TestCase):
+
+    def test_init_and_properties(self):
+        vocabulary = SortedVocabulary()
+        assert vocabulary.size == 0
+        assert vocabulary.is_empty() is True
+        assert vocabulary.strings() == []
+        assert vocabulary.complete('') == []
+        vocabulary = SortedVocabulary(['XYZ', 'ABC', 'A', 'ABC'])
+        assert vocabulary.size == 3
+        assert vocabulary.blob == 'AABCXYZ'
+        assert list(vocabulary.offsets) == [0, 1, 4, 7]
+
+    def test_contains(self):
+        vocabulary = SortedVocabulary(['ABC', 'ABD', 'A', 'XYZ', ''])
+        for string in ['ABC', 'ABD', 'A', 'XYZ', '']:
+            assert vocabulary.contains(string) is True
+        for string in ['AB', 'B', 'XY', 'XYZW', 'ZZZ']:
+            assert vocabulary.contains(string) is False
+
+    def test_complete(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ', 'AC', 'WAFFLE TIME']
+        vocabulary = SortedVocabulary(strings)
+        assert vocabulary.complete('A') == ['A', 'ABC', 'ABD', 'AC']
+        assert vocabulary.complete('AB') == ['ABC', 'ABD']
+        assert vocabulary.complete('ABC') == ['ABC']
+        assert vocabulary.complete('B') == []
+        assert vocabulary.complete('XYZW') == []
+        assert vocabulary.complete('') == sorted(strings)
+        assert vocabulary.count('A') == 4
+        assert vocabulary.count('Z') == 0
+        completions = vocabulary.complete_many(['A', 'X'])
+        assert completions == {'A': ['A', 'ABC', 'ABD', 'AC'], 'X': ['XYZ']}
+
+    def test_complete_with_largest_code_point(self):
+        largest = chr(sys.maxunicode)
+        strings = ['A', 'A' + largest, 'A' + largest + 'B', 'B']
+        vocabulary = SortedVocabulary(strings)
+        assert vocabulary.complete('A' + largest) == strings[1:3]
+        assert vocabulary.complete('A') == strings[:3]
+
+    def test_same_results_as_prefix_tree(self):
+        strings = 'Peter Piper picked a peck of pickled peppers'.split()
+        vocabulary = SortedVocabulary(strings)
+        tree = PrefixTree(strings)
+        for prefix in ['', 'P', 'p', 'pi', 'pe', 'pick', 'o', 'q']:
+            assert vocabulary.complete(prefix) == sorted(tree.complete(prefix))
+
+
+if __name__ == '__main__':
+    unittest.main()